@@ -12,12 +12,17 @@ API documentation available at:
     http://localhost:8000/redoc (ReDoc)
 """
 
+import asyncio
+
 import uvicorn
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+from backend.middleware.cors import PureASGICORS
 from backend.models.schemas import HealthResponse
 from backend.routers import config, stream
+from backend.services.broadcaster import broadcaster
+from backend.services.stream_manager import stream_manager
 from backend.websockets import transcript
 from logger import get_logger
 
@@ -30,11 +35,12 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
-# CORS middleware for React frontend
+# CORS middleware for React frontend (pure ASGI, no per-request Request/Response objects)
 app.add_middleware(
-    CORSMiddleware,
+    PureASGICORS,
     allow_origins=[
         "http://localhost",  # Nginx proxy (Docker)
         "http://localhost:80",  # Nginx proxy explicit port
@@ -47,9 +53,6 @@ app.add_middleware(
         "http://127.0.0.1:5173",
         "http://127.0.0.1:5174",
     ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
 )
 
 # Include routers
@@ -61,6 +64,9 @@ app.include_router(transcript.router)
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup."""
+    # Let the stream thread publish transcript messages onto this loop
+    stream_manager.attach_loop(asyncio.get_running_loop())
+
     logger.info("=" * 60)
     logger.info("AI Avatar Stream API - Starting")
     logger.info("=" * 60)
@@ -73,6 +79,7 @@ async def startup_event():
 async def shutdown_event():
     """Run on application shutdown."""
     logger.info("AI Avatar Stream API - Shutting down")
+    broadcaster.close()
 
 
 @app.get("/", tags=["root"])
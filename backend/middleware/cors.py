@@ -0,0 +1,109 @@
+"""
+Pure ASGI CORS middleware.
+
+Answers preflight requests directly and injects CORS headers into the raw
+``http.response.start`` message, so the REST endpoints polled by the React
+frontend don't pay for Request/Response object creation on every call.
+"""
+
+from typing import Iterable
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Methods advertised on preflight responses (equivalent to allow_methods=["*"])
+ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+# How long browsers may cache a preflight response (seconds)
+PREFLIGHT_MAX_AGE = b"600"
+
+
+class PureASGICORS:
+    """
+    Minimal credentialed CORS middleware operating on raw ASGI messages.
+
+    Only origins listed in ``allow_origins`` receive CORS headers; the origin
+    is echoed back (never ``*``) because credentials are allowed. Any request
+    header asked for in a preflight is allowed.
+    """
+
+    def __init__(self, app: ASGIApp, allow_origins: Iterable[str]):
+        self.app = app
+        self.allowed = frozenset(o.encode() for o in allow_origins)
+
+        # Static header blocks, built once instead of per request
+        self._preflight_headers = (
+            (b"access-control-allow-methods", ALLOW_METHODS),
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-max-age", PREFLIGHT_MAX_AGE),
+            (b"vary", b"Origin"),
+        )
+        self._simple_headers = (
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for key, value in scope["headers"]:
+            if key == b"origin":
+                origin = value
+            elif key == b"access-control-request-method":
+                request_method = value
+            elif key == b"access-control-request-headers":
+                request_headers = value
+
+        # Not a cross-origin request - nothing to do
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Preflight: answer directly without touching the application
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._send_preflight(origin, request_headers, send)
+            return
+
+        if origin not in self.allowed:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.append((b"access-control-allow-origin", origin))
+                headers.extend(self._simple_headers)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_preflight(
+        self, origin: bytes, request_headers: bytes | None, send: Send
+    ):
+        """Send a preflight response for ``origin`` (400 if the origin is not allowed)."""
+        if origin not in self.allowed:
+            body = b"Disallowed CORS origin"
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 400,
+                    "headers": [
+                        (b"content-type", b"text/plain; charset=utf-8"),
+                        (b"content-length", str(len(body)).encode()),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        headers = [(b"access-control-allow-origin", origin), *self._preflight_headers]
+        if request_headers:
+            headers.append((b"access-control-allow-headers", request_headers))
+
+        await send({"type": "http.response.start", "status": 204, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
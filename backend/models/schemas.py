@@ -77,6 +77,12 @@ class ConfigUpdate(BaseModel):
         None, ge=0, le=10, description="Pause duration in seconds"
     )
     topics: Optional[List[str]] = Field(None, description="Available discussion topics")
+    transcript_flush_ms: Optional[int] = Field(
+        None,
+        ge=0,
+        le=1000,
+        description="Transcript WebSocket batching interval in milliseconds",
+    )
 
 
 class ConfigUpdateResponse(BaseModel):
@@ -7,6 +7,8 @@ Provides REST API endpoints for:
 - Updating stream configuration
 """
 
+import dataclasses
+import logging
 from typing import Dict, List
 
 from fastapi import APIRouter, HTTPException
@@ -18,6 +20,28 @@ from logger import get_logger
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/config", tags=["config"])
 
+# Agents are static at runtime, so validate them once instead of per request
+_AGENTS_CACHED = {key: AgentConfig(**agent) for key, agent in app_config.AGENTS.items()}
+
+
+def _build_settings() -> Dict:
+    """Snapshot the current stream settings from the config module."""
+    settings = app_config.SETTINGS
+    return {
+        "max_turns": settings.max_turns,
+        "pause_between_turns": settings.pause_between_turns,
+        "topic_switch_every": app_config.TOPIC_SWITCH_EVERY,
+        "context_window": app_config.CONTEXT_WINDOW,
+        "groq_model": app_config.GROQ_MODEL,
+        "audio_dir": app_config.AUDIO_DIR,
+        "chars_per_second": app_config.CHARS_PER_SECOND,
+        "transcript_flush_ms": settings.transcript_flush_ms,
+    }
+
+
+# Rebuilt only when update_config changes a setting
+_settings_cache = _build_settings()
+
 
 @router.get("/agents", response_model=Dict[str, AgentConfig])
 async def get_agents():
@@ -28,12 +52,7 @@ async def get_agents():
     including voice IDs, colors, and system prompts.
     """
     logger.debug("API request: get agents")
-
-    agents_response = {}
-    for key, agent_data in app_config.AGENTS.items():
-        agents_response[key] = AgentConfig(**agent_data)
-
-    return agents_response
+    return _AGENTS_CACHED
 
 
 @router.get("/topics", response_model=List[str])
@@ -44,7 +63,7 @@ async def get_topics():
     Returns a list of all topics that can be used for AI discussions.
     """
     logger.debug("API request: get topics")
-    return app_config.TOPICS
+    return list(app_config.SETTINGS.topics)
 
 
 @router.get("/settings")
@@ -55,16 +74,7 @@ async def get_settings():
     Returns all configurable settings like max_turns, pause_between_turns, etc.
     """
     logger.debug("API request: get settings")
-
-    return {
-        "max_turns": app_config.MAX_TURNS,
-        "pause_between_turns": app_config.PAUSE_BETWEEN_TURNS,
-        "topic_switch_every": app_config.TOPIC_SWITCH_EVERY,
-        "context_window": app_config.CONTEXT_WINDOW,
-        "groq_model": app_config.GROQ_MODEL,
-        "audio_dir": app_config.AUDIO_DIR,
-        "chars_per_second": app_config.CHARS_PER_SECOND,
-    }
+    return _settings_cache
 
 
 @router.put("/", response_model=ConfigUpdateResponse)
@@ -78,20 +88,24 @@ async def update_config(config_update: ConfigUpdate):
     - **max_turns**: Default number of turns for new streams
     - **pause_between_turns**: Pause duration in seconds between turns
     - **topics**: List of available discussion topics
+    - **transcript_flush_ms**: Transcript WebSocket batching interval (applies immediately)
     """
-    logger.info(f"API request: update config - {config_update.dict(exclude_none=True)}")
+    global _settings_cache
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "API request: update config - %s", config_update.dict(exclude_none=True)
+        )
 
-    updated_fields = []
+    changes = {}
 
     # Update max_turns
     if config_update.max_turns is not None:
-        app_config.MAX_TURNS = config_update.max_turns
-        updated_fields.append("max_turns")
+        changes["max_turns"] = config_update.max_turns
 
     # Update pause_between_turns
     if config_update.pause_between_turns is not None:
-        app_config.PAUSE_BETWEEN_TURNS = config_update.pause_between_turns
-        updated_fields.append("pause_between_turns")
+        changes["pause_between_turns"] = config_update.pause_between_turns
 
     # Update topics
     if config_update.topics is not None:
@@ -99,15 +113,24 @@ async def update_config(config_update: ConfigUpdate):
             raise HTTPException(
                 status_code=400, detail="At least one topic is required"
             )
-        app_config.TOPICS = config_update.topics
-        updated_fields.append("topics")
+        changes["topics"] = tuple(config_update.topics)
+
+    # Update transcript_flush_ms
+    if config_update.transcript_flush_ms is not None:
+        changes["transcript_flush_ms"] = config_update.transcript_flush_ms
+
+    updated_fields = list(changes)
 
     if not updated_fields:
         return ConfigUpdateResponse(
             success=False, message="No fields provided to update", updated_fields=[]
         )
 
-    logger.info(f"Configuration updated: {updated_fields}")
+    # Copy-on-write: readers holding the old Settings are unaffected
+    app_config.SETTINGS = dataclasses.replace(app_config.SETTINGS, **changes)
+    _settings_cache = _build_settings()
+
+    logger.info("Configuration updated: %s", updated_fields)
 
     return ConfigUpdateResponse(
         success=True,
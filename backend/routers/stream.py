@@ -16,15 +16,12 @@ from backend.models.schemas import (
     StreamStopRequest,
     StreamStopResponse,
 )
-from backend.services.stream_manager import StreamManager
+from backend.services.stream_manager import stream_manager
 from logger import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/stream", tags=["stream"])
 
-# Get singleton instance
-stream_manager = StreamManager()
-
 
 @router.post("/start", response_model=StreamStartResponse)
 async def start_stream(request: StreamStartRequest):
@@ -37,7 +34,7 @@ async def start_stream(request: StreamStartRequest):
 
     Raises 409 Conflict if a stream is already running.
     """
-    logger.info(f"API request: start stream with max_turns={request.max_turns}")
+    logger.info("API request: start stream with max_turns=%s", request.max_turns)
 
     result = stream_manager.start_stream(max_turns=request.max_turns)
 
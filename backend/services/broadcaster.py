@@ -0,0 +1,107 @@
+"""
+Broadcaster service for fanning transcript updates out to WebSocket clients.
+
+A single module-level instance (``broadcaster``) is shared by the stream
+manager, which publishes onto the event loop, and the WebSocket handlers,
+which each subscribe with their own queue.
+
+Messages published within transcript_flush_ms of each other are coalesced
+into one "transcript_batch" frame. The frame is encoded once and the same
+bytes object is handed to every subscriber, so N clients cost one encode.
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Set
+
+import orjson
+
+import config as app_config
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+# Flush immediately once this many messages are pending
+MAX_BATCH = 140
+
+# Frames buffered per client before a slow client starts missing batches
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+class Broadcaster:
+    """Pub/sub fanout of encoded transcript batches (use the ``broadcaster`` instance)."""
+
+    def __init__(self):
+        self.subscribers: Set[asyncio.Queue] = set()
+        self._batch: List[Dict] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Register a new subscriber.
+
+        Returns:
+            Queue that receives each encoded batch frame (bytes)
+        """
+        subscriber: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers.add(subscriber)
+        logger.debug("Broadcaster subscriber added (%s total)", len(self.subscribers))
+        return subscriber
+
+    def unsubscribe(self, subscriber: asyncio.Queue):
+        """Remove a subscriber queue returned by subscribe()."""
+        self.subscribers.discard(subscriber)
+        logger.debug("Broadcaster subscriber removed (%s total)", len(self.subscribers))
+
+    def publish(self, message: Dict):
+        """
+        Add a message to the current batch.
+
+        Must run on the event loop; other threads go through
+        loop.call_soon_threadsafe(broadcaster.publish, message). Messages
+        published while nobody is subscribed are dropped.
+        """
+        if not self.subscribers:
+            return
+
+        self._batch.append(message)
+        if len(self._batch) >= MAX_BATCH:
+            self.flush()
+        elif self._flush_handle is None:
+            delay = app_config.SETTINGS.transcript_flush_ms / 1000
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                delay, self.flush
+            )
+
+    def flush(self):
+        """Encode the pending batch once and hand it to every subscriber."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if not self._batch:
+            return
+
+        batch, self._batch = self._batch, []
+        frame = orjson.dumps({"type": "transcript_batch", "items": batch})
+
+        for subscriber in self.subscribers:
+            try:
+                subscriber.put_nowait(frame)
+            except asyncio.QueueFull:
+                logger.warning(
+                    "WebSocket client is too slow, dropping a transcript batch"
+                )
+
+        logger.debug(
+            "Broadcast %s message(s) to %s client(s)", len(batch), len(self.subscribers)
+        )
+
+    def close(self):
+        """Cancel any pending flush and drop unsent messages (application shutdown)."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._batch.clear()
+
+
+broadcaster = Broadcaster()
@@ -1,7 +1,8 @@
 """
 StreamManager service for managing AI discussion stream lifecycle.
 
-This is a singleton service that:
+A single module-level instance (``stream_manager``) is shared by the
+routers. It:
 - Manages stream state (running/stopped)
 - Runs streams in background threads
 - Broadcasts transcript updates to WebSocket clients
@@ -10,72 +11,108 @@ This is a singleton service that:
 
 import asyncio
 import os
+import queue
 import random
 import threading
 import time
-from datetime import datetime
-from queue import Queue  # Thread-safe queue for async/sync communication
-from typing import Dict, List, Optional
-
-from config import (
-    AGENTS,
-    AUDIO_DIR,
-    MAX_TURNS,
-    PAUSE_BETWEEN_TURNS,
-    TOPIC_SWITCH_EVERY,
-    TOPICS,
-)
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, Optional
+
+import config as app_config
+from backend.services.broadcaster import broadcaster
+from config import AGENT_CFG, AUDIO_DIR, TOPIC_SWITCH_EVERY
 from core.avatar import connect as connect_obs
-from core.avatar import (
-    set_avatar,
-    set_both_idle,
-    start_idle_animation,
-    stop_idle_animation,
-)
+from core.avatar import set_both_idle
 from core.dialogue import generate_response, reset_history
-from core.overlay import update_overlay
-from core.transcript import init_transcript, log_message, set_broadcast_callback
-from core.tts import play_audio, text_to_speech
+from core.overlay import init_overlay, update_overlay
+from core.transcript import (
+    close_transcript,
+    init_transcript,
+    log_message,
+    set_broadcast_callback,
+)
+from core.tts import play_audio, render_speech
 from logger import get_logger
 
 logger = get_logger(__name__)
 
+# Audio output directory (idempotent, done once at import)
+os.makedirs(AUDIO_DIR, exist_ok=True)
 
-class StreamManager:
-    """Singleton service to manage AI stream lifecycle."""
+# Per-turn audio file names (max_turns is capped at 100 by the API schema)
+_TURN_FILES = tuple(f"turn_{i}.mp3" for i in range(101))
 
-    _instance: Optional["StreamManager"] = None
-    _lock = threading.Lock()
+# Turns generated ahead of playback (bounds clips waiting in memory or on disk)
+_PREFETCH_DEPTH = 2
 
-    def __new__(cls):
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
-        return cls._instance
+# Seconds a finished stream waits for its producer thread before giving up on it
+_PRODUCER_JOIN_TIMEOUT = 15.0
+
+# Opening line spoken by agent1 at the start of every stream
+_OPENING_TMPL = (
+    "Welcome, everyone! Today we're going to explore a fascinating question: "
+    "{topic} Let's dive in."
+)
+
+
+def _pick_other_topic(topics: tuple[str, ...], current_idx: int) -> int:
+    """
+    Pick a random topic index other than current_idx in O(1).
+
+    Draws from the N-1 remaining slots and shifts past the current one,
+    so no filtered list is built. current_idx may be -1 (no current topic).
+    """
+    if current_idx < 0:
+        return random.randrange(len(topics))
+    if len(topics) < 2:
+        return current_idx
+    j = random.randrange(len(topics) - 1)
+    return j if j < current_idx else j + 1
 
-    def __init__(self):
-        if self._initialized:
-            return
 
-        self._initialized = True
+class StreamManager:
+    """Service to manage AI stream lifecycle (use the ``stream_manager`` instance)."""
+
+    def __init__(self):
+        self._state_lock = threading.Lock()
         self.is_running = False
         self.current_turn = 0
         self.current_topic = ""
-        self.max_turns = MAX_TURNS
-        self.errors: List[str] = []
+        self.max_turns = app_config.SETTINGS.max_turns
+        self.errors: Deque[str] = deque(maxlen=10)  # Last 10 errors
         self.stream_thread: Optional[threading.Thread] = None
         self.stop_flag = threading.Event()
 
-        # Thread-safe queue for passing transcript messages from sync thread to async WebSocket handlers
-        self.transcript_queue: Queue = Queue()
+        # Event loop that owns the broadcaster. The stream thread publishes
+        # onto it via loop.call_soon_threadsafe.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
         # Set up transcript broadcasting
         set_broadcast_callback(self.broadcast_transcript)
 
         logger.info("StreamManager initialized")
 
+    def attach_loop(self, loop: asyncio.AbstractEventLoop):
+        """
+        Bind the event loop that the broadcaster runs on.
+
+        Called from the FastAPI startup hook; messages published before a loop
+        is attached are dropped.
+
+        Args:
+            loop: The running event loop of the API server
+        """
+        self._loop = loop
+        logger.debug("StreamManager attached to event loop")
+
+    def _publish(self, message: Dict):
+        """Hand a message to the broadcaster on the event loop (safe from any thread)."""
+        if self._loop is None:
+            logger.debug("No event loop attached, dropping WebSocket message")
+            return
+        self._loop.call_soon_threadsafe(broadcaster.publish, message)
+
     def start_stream(self, max_turns: int = 5) -> Dict[str, any]:
         """
         Start the AI discussion stream in a background thread.
@@ -86,7 +123,7 @@ class StreamManager:
         Returns:
             Dict with success status and message
         """
-        with self._lock:
+        with self._state_lock:
             if self.is_running:
                 logger.warning("Attempted to start stream while already running")
                 return {
@@ -98,7 +135,7 @@ class StreamManager:
             self.max_turns = max_turns
             self.current_turn = 0
             self.current_topic = ""
-            self.errors = []
+            self.errors.clear()
             self.stop_flag.clear()
             self.is_running = True
 
@@ -106,7 +143,7 @@ class StreamManager:
             self.stream_thread = threading.Thread(target=self._run_stream, daemon=True)
             self.stream_thread.start()
 
-            logger.info(f"Stream started with max_turns={max_turns}")
+            logger.info("Stream started with max_turns=%s", max_turns)
 
             # Broadcast initial status
             self.broadcast_status()
@@ -124,7 +161,7 @@ class StreamManager:
         Returns:
             Dict with success status and message
         """
-        with self._lock:
+        with self._state_lock:
             if not self.is_running:
                 logger.warning("Attempted to stop stream that is not running")
                 return {"success": False, "message": "No stream is currently running"}
@@ -149,15 +186,15 @@ class StreamManager:
             "current_turn": self.current_turn,
             "current_topic": self.current_topic,
             "max_turns": self.max_turns,
-            "errors": self.errors[-10:],  # Last 10 errors
+            "errors": list(self.errors),
         }
 
     def broadcast_transcript(self, message: Dict):
         """
-        Send transcript message to WebSocket clients via thread-safe queue.
+        Send transcript message to WebSocket clients via the broadcaster.
 
-        Called from the stream thread (sync context). Messages are placed in a
-        queue and consumed by async WebSocket handlers.
+        Called from the stream thread (sync context). Messages are scheduled onto
+        the event loop with call_soon_threadsafe and fanned out by the broadcaster.
 
         Args:
             message: Dict with timestamp, agent_name, text, topic
@@ -165,164 +202,282 @@ class StreamManager:
         # Add turn number to message
         message["turn"] = self.current_turn
 
-        # Put message in thread-safe queue for async WebSocket handlers to consume
+        # Schedule onto the event loop for async WebSocket handlers to consume
         try:
-            self.transcript_queue.put_nowait(message)
+            self._publish(message)
             logger.debug(
-                f"Queued transcript message from {message.get('agent_name', 'system')}"
+                "Queued transcript message from %s", message.get("agent_name", "system")
             )
         except Exception as e:
-            logger.error(f"Error queuing transcript message: {e}")
+            logger.error("Error queuing transcript message: %s", e)
 
     def broadcast_status(self):
         """
-        Send status update to WebSocket clients via thread-safe queue.
+        Send status update to WebSocket clients via the broadcaster.
 
         Called when stream state changes (start/stop/turn update).
         """
         status_message = {"type": "status", "data": self.get_status()}
 
         try:
-            self.transcript_queue.put_nowait(status_message)
+            self._publish(status_message)
             logger.debug(
-                f"Queued status update: turn={self.current_turn}, running={self.is_running}"
+                "Queued status update: turn=%s, running=%s",
+                self.current_turn,
+                self.is_running,
             )
         except Exception as e:
-            logger.error(f"Error queuing status message: {e}")
+            logger.error("Error queuing status message: %s", e)
+
+    def _put_prefetched(
+        self, prefetch_q: queue.Queue, consumer_done: threading.Event, item
+    ) -> bool:
+        """Block until item is queued; give up (False) once the stream is stopping."""
+        while not (consumer_done.is_set() or self.stop_flag.is_set()):
+            try:
+                prefetch_q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce_turns(
+        self, prefetch_q: queue.Queue, consumer_done: threading.Event, topic_idx: int
+    ):
+        """
+        Generate reply text and audio for each turn ahead of playback.
+
+        Runs in its own thread and feeds (turn, agent_key, topic, text, audio,
+        error) tuples into prefetch_q, followed by None when all turns are done. Owns
+        topic switching, so prefetched turns are generated for the right topic.
+
+        Args:
+            prefetch_q: Bounded queue shared with the playback loop
+            consumer_done: Set by the playback loop when it stops consuming
+            topic_idx: Index of the starting topic in the current settings
+        """
+        topic = self.current_topic
+
+        for turn in range(self.max_turns):
+            if consumer_done.is_set() or self.stop_flag.is_set():
+                return
+
+            settings = app_config.SETTINGS
+
+            # Alternate speakers
+            agent_key = "agent2" if turn % 2 == 0 else "agent1"
+            text = None
+            audio = None
+            error = None
+
+            try:
+                logger.info(
+                    "Turn %s/%s: %s thinking...",
+                    turn + 1,
+                    self.max_turns,
+                    AGENT_CFG[agent_key].name,
+                )
+
+                # Generate reply + speech. A reply arriving after playback
+                # stopped is neither remembered nor rendered to a turn file.
+                text = generate_response(agent_key, topic, cancelled=consumer_done)
+                if consumer_done.is_set() or self.stop_flag.is_set():
+                    return
+                audio = render_speech(text, agent_key, _TURN_FILES[turn])
+                if audio is None:
+                    error = "TTS failed"
+
+            except Exception as e:
+                logger.error("Error preparing turn %s: %s", turn + 1, e, exc_info=True)
+                error = str(e)
+
+            if not self._put_prefetched(
+                prefetch_q, consumer_done, (turn, agent_key, topic, text, audio, error)
+            ):
+                return
+
+            # Topic switch: applies to turns generated from here on
+            if (turn + 1) % TOPIC_SWITCH_EVERY == 0 and turn < self.max_turns - 2:
+                topics = settings.topics
+                if topic_idx >= len(topics) or topics[topic_idx] != topic:
+                    topic_idx = -1  # Topics were updated mid-stream
+                topic_idx = _pick_other_topic(topics, topic_idx)
+                topic = topics[topic_idx]
+                reset_history()
+
+        self._put_prefetched(prefetch_q, consumer_done, None)
 
     def _run_stream(self):
         """
         Main stream loop (runs in background thread).
-        This is the core logic from main.py adapted for threaded execution.
+        This is the core logic from main.py adapted for threaded execution:
+        playback happens here while _produce_turns prepares the next turns.
         """
         try:
             logger.info("Stream thread started")
-            start_time = datetime.now()
+            start_time = time.monotonic()
             successful_turns = 0
             failed_turns = 0
 
-            # Ensure directories exist
-            os.makedirs(AUDIO_DIR, exist_ok=True)
-
             # Fresh transcript
             init_transcript()
 
-            # Connect to OBS
-            connect_obs()
-            set_both_idle()
+            # Overlay page is written once; turns only update its data file
+            init_overlay()
 
-            # Start idle animations
-            start_idle_animation("agent1")
-            start_idle_animation("agent2")
+            # Snapshot runtime settings (the API may swap in a new Settings object)
+            settings = app_config.SETTINGS
 
             # Pick starting topic
-            self.current_topic = random.choice(TOPICS)
-            logger.info(f"Starting topic: {self.current_topic}")
+            topic_idx = random.randrange(len(settings.topics))
+            self.current_topic = settings.topics[topic_idx]
+            logger.info("Starting topic: %s", self.current_topic)
 
             # Opening line
-            opening_text = (
-                f"Welcome, everyone! Today we're going to explore a fascinating question: "
-                f"{self.current_topic} Let's dive in."
-            )
+            opening_text = _OPENING_TMPL.format(topic=self.current_topic)
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                # Synthesize the opening while the OBS handshake runs
+                opening_future = executor.submit(
+                    render_speech, opening_text, "agent1", "opening.mp3"
+                )
+
+                # Connect to OBS
+                connect_obs()
+                # OBS holds the idle image until the next swap
+                set_both_idle()
+
+                opening_audio = opening_future.result()
 
-            audio_file = "opening.mp3"
-            if text_to_speech(opening_text, "agent1", audio_file):
+            if opening_audio is not None:
                 update_overlay("agent1", opening_text, self.current_topic)
                 log_message(
-                    AGENTS["agent1"]["name"], opening_text, topic=self.current_topic
+                    AGENT_CFG["agent1"].name, opening_text, topic=self.current_topic
                 )
-                play_audio(audio_file, "agent1", opening_text)
-                time.sleep(PAUSE_BETWEEN_TURNS)
+                play_audio(opening_audio, "agent1", opening_text)
+                # Returns early if a stop is requested; the loop below then exits
+                self.stop_flag.wait(settings.pause_between_turns)
             else:
                 logger.warning("Failed to generate opening audio, continuing anyway")
 
-            # Main loop
-            for turn in range(self.max_turns):
-                # Check stop flag
-                if self.stop_flag.is_set():
-                    logger.info("Stream stopped by user request")
-                    break
+            # Main loop: a producer thread generates text + audio for upcoming
+            # turns while this thread plays the current one
+            prefetch_q: queue.Queue = queue.Queue(maxsize=_PREFETCH_DEPTH)
+            consumer_done = threading.Event()
+            producer = threading.Thread(
+                target=self._produce_turns,
+                args=(prefetch_q, consumer_done, topic_idx),
+                daemon=True,
+            )
+            producer.start()
+
+            try:
+                while True:
+                    try:
+                        item = prefetch_q.get(timeout=0.5)
+                    except queue.Empty:
+                        if self.stop_flag.is_set():
+                            logger.info("Stream stopped by user request")
+                            break
+                        continue
 
-                try:
-                    self.current_turn = turn + 1
+                    if item is None:
+                        break  # Producer finished all turns
 
-                    # Broadcast status update for new turn
-                    self.broadcast_status()
+                    if self.stop_flag.is_set():
+                        logger.info("Stream stopped by user request")
+                        break
 
-                    # Alternate speakers
-                    agent_key = "agent2" if turn % 2 == 0 else "agent1"
-                    agent = AGENTS[agent_key]
+                    turn, agent_key, topic, text, audio, error = item
 
-                    logger.info(
-                        f"Turn {turn + 1}/{self.max_turns}: {agent['name']} thinking..."
-                    )
+                    try:
+                        settings = app_config.SETTINGS
 
-                    # Generate reply
-                    text = generate_response(agent_key, self.current_topic)
+                        # Topic switch (decided by the producer)
+                        if topic != self.current_topic:
+                            self.current_topic = topic
+                            logger.info("Topic switched to: %s", topic)
+                            log_message("", "", topic=topic)
+                            if self.stop_flag.wait(1):
+                                logger.info("Stream stopped by user request")
+                                break
 
-                    # Speech
-                    audio_file = f"turn_{turn}.mp3"
-                    success = text_to_speech(text, agent_key, audio_file)
-                    if not success:
-                        logger.warning(f"Turn {turn + 1} skipped - TTS failed")
-                        failed_turns += 1
-                        self.errors.append(f"Turn {turn + 1}: TTS failed")
-                        continue
+                        self.current_turn = turn + 1
 
-                    # Overlay + transcript
-                    update_overlay(agent_key, text, self.current_topic)
-                    log_message(agent["name"], text)
+                        # Broadcast status update for new turn
+                        self.broadcast_status()
 
-                    # Play audio
-                    logger.info(f"{agent['name']}: {text}")
-                    play_audio(audio_file, agent_key, text)
+                        if error is not None:
+                            logger.warning("Turn %s skipped - %s", turn + 1, error)
+                            failed_turns += 1
+                            self.errors.append(f"Turn {turn + 1}: {error}")
+                            continue
 
-                    successful_turns += 1
+                        name = AGENT_CFG[agent_key].name
 
-                    # Pause
-                    time.sleep(PAUSE_BETWEEN_TURNS)
+                        # Overlay + transcript
+                        update_overlay(agent_key, text, topic)
+                        log_message(name, text)
 
-                    # Topic switch
-                    if (
-                        turn + 1
-                    ) % TOPIC_SWITCH_EVERY == 0 and turn < self.max_turns - 2:
-                        self.current_topic = random.choice(
-                            [t for t in TOPICS if t != self.current_topic]
-                        )
-                        reset_history()
-                        logger.info(f"Topic switched to: {self.current_topic}")
-                        log_message("", "", topic=self.current_topic)
-                        time.sleep(1)
+                        # Play audio
+                        logger.info("%s: %s", name, text)
+                        play_audio(audio, agent_key, text)
 
-                except Exception as e:
-                    logger.error(f"Error in turn {turn + 1}: {e}", exc_info=True)
-                    failed_turns += 1
-                    self.errors.append(f"Turn {turn + 1}: {str(e)}")
+                        successful_turns += 1
 
-            # Stop idle animation
-            stop_idle_animation()
+                        # Pause (wakes immediately if a stop is requested)
+                        if self.stop_flag.wait(settings.pause_between_turns):
+                            logger.info("Stream stopped by user request")
+                            break
+
+                    except Exception as e:
+                        logger.error("Error in turn %s: %s", turn + 1, e, exc_info=True)
+                        failed_turns += 1
+                        self.errors.append(f"Turn {turn + 1}: {str(e)}")
+            finally:
+                # Tell the producer to stop generating further turns, drop
+                # what it already queued, and wait for it - is_running stays
+                # set meanwhile, so the next stream can't start while it may
+                # still write turn files
+                consumer_done.set()
+                while True:
+                    try:
+                        prefetch_q.get_nowait()
+                    except queue.Empty:
+                        break
+                producer.join(timeout=_PRODUCER_JOIN_TIMEOUT)
+                if producer.is_alive():
+                    logger.warning(
+                        "Producer thread still busy after %.0fs, not waiting for it",
+                        _PRODUCER_JOIN_TIMEOUT,
+                    )
 
             # Summary
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            duration = time.monotonic() - start_time
             success_rate = (
                 (successful_turns / self.max_turns * 100) if self.max_turns > 0 else 0
             )
 
             logger.info("=" * 60)
             logger.info("Stream finished!")
-            logger.info(f"Duration: {duration:.1f}s")
+            logger.info("Duration: %.1fs", duration)
             logger.info(
-                f"Successful turns: {successful_turns}/{self.max_turns} ({success_rate:.1f}%)"
+                "Successful turns: %s/%s (%.1f%%)",
+                successful_turns,
+                self.max_turns,
+                success_rate,
             )
-            logger.info(f"Failed turns: {failed_turns}")
+            logger.info("Failed turns: %s", failed_turns)
             logger.info("=" * 60)
 
         except Exception as e:
-            logger.critical(f"Fatal error in stream thread: {e}", exc_info=True)
+            logger.critical("Fatal error in stream thread: %s", e, exc_info=True)
             self.errors.append(f"Fatal: {str(e)}")
         finally:
-            with self._lock:
+            # Flush buffered transcript lines to disk
+            close_transcript()
+
+            with self._state_lock:
                 self.is_running = False
                 self.current_turn = 0
 
@@ -330,3 +485,7 @@ class StreamManager:
             self.broadcast_status()
 
             logger.info("Stream thread ended")
+
+
+# Shared instance used by the API routers and WebSocket handlers
+stream_manager = StreamManager()
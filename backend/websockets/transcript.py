@@ -4,22 +4,28 @@ WebSocket endpoint for real-time transcript updates.
 Provides a WebSocket connection that streams transcript messages
 as they are generated during the AI discussion.
 
-Uses a thread-safe queue to receive messages from the sync stream thread.
+Each connection subscribes to the shared broadcaster, which coalesces
+messages into "transcript_batch" frames and encodes each frame once for all
+clients; a per-connection task forwards those frames to the socket.
 """
 
 import asyncio
 import json
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from backend.services.stream_manager import StreamManager
+from backend.services.broadcaster import broadcaster
+from backend.services.stream_manager import stream_manager
 from logger import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter()
 
-# Get singleton instance
-stream_manager = StreamManager()
+
+async def send_json_fast(websocket: WebSocket, obj) -> None:
+    """Send obj as a binary (UTF-8) JSON frame, serialized with orjson."""
+    await websocket.send_bytes(orjson.dumps(obj))
 
 
 @router.websocket("/ws/transcript")
@@ -30,6 +36,11 @@ async def transcript_websocket(websocket: WebSocket):
     Clients connect to this endpoint and receive transcript messages
     as agents speak during the discussion.
 
+    All messages are sent as binary (UTF-8) JSON frames. Transcript and
+    status updates are delivered one frame per flush as
+    {"type": "transcript_batch", "items": [...]}; direct replies
+    (connection, pong, status, error) are single objects.
+
     Message format:
     {
         "timestamp": "2026-02-28T14:32:15.123456",
@@ -46,60 +57,39 @@ async def transcript_websocket(websocket: WebSocket):
 
     # Send welcome message
     try:
-        await websocket.send_json(
+        await send_json_fast(
+            websocket,
             {
                 "type": "connection",
                 "message": "Connected to transcript stream",
                 "status": stream_manager.get_status(),
-            }
+            },
         )
     except Exception as e:
-        logger.error(f"Error sending welcome message: {e}")
+        logger.error("Error sending welcome message: %s", e)
         return
 
     # Flag to stop background tasks
     stop_tasks = asyncio.Event()
 
-    async def send_transcript_messages():
-        """
-        Background task to poll the queue and send transcript messages.
-        Runs until WebSocket disconnects or stop_tasks is set.
-        """
-        try:
-            while not stop_tasks.is_set():
-                # Check if there are messages in the queue (non-blocking)
-                if not stream_manager.transcript_queue.empty():
-                    try:
-                        message = stream_manager.transcript_queue.get_nowait()
-                        await websocket.send_json(message)
-                        logger.debug(
-                            f"Sent transcript message: {message.get('agent_name', 'topic_change')}"
-                        )
-                    except Exception as e:
-                        logger.error(f"Error sending transcript message: {e}")
-                        break
-
-                # Sleep briefly to avoid busy-waiting
-                await asyncio.sleep(0.1)
-
-        except asyncio.CancelledError:
-            logger.debug("Transcript sender task cancelled")
-        except Exception as e:
-            logger.error(f"Error in transcript sender: {e}")
-
     async def receive_client_messages():
         """
         Background task to receive and process client messages.
         Runs until WebSocket disconnects or stop_tasks is set.
         """
+        stop_waiter = asyncio.create_task(stop_tasks.wait())
+        recv_waiter = asyncio.create_task(websocket.receive_text())
         try:
-            while not stop_tasks.is_set():
-                # Receive message from client with timeout
-                try:
-                    data = await asyncio.wait_for(websocket.receive_text(), timeout=1.0)
-                except asyncio.TimeoutError:
-                    # No message received, continue loop
-                    continue
+            while True:
+                # Sleep until the client sends something or we're told to stop
+                done, _ = await asyncio.wait(
+                    {stop_waiter, recv_waiter}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if recv_waiter not in done:
+                    break
+
+                data = recv_waiter.result()
+                recv_waiter = asyncio.create_task(websocket.receive_text())
 
                 # Parse and handle client message
                 try:
@@ -107,19 +97,22 @@ async def transcript_websocket(websocket: WebSocket):
                     command = client_message.get("command")
 
                     if command == "ping":
-                        await websocket.send_json({"type": "pong"})
+                        await send_json_fast(websocket, {"type": "pong"})
                     elif command == "status":
                         status = stream_manager.get_status()
-                        await websocket.send_json({"type": "status", "data": status})
+                        await send_json_fast(
+                            websocket, {"type": "status", "data": status}
+                        )
                     else:
-                        await websocket.send_json(
-                            {"type": "error", "message": f"Unknown command: {command}"}
+                        await send_json_fast(
+                            websocket,
+                            {"type": "error", "message": f"Unknown command: {command}"},
                         )
 
                 except json.JSONDecodeError:
-                    logger.warning(f"Invalid JSON from client: {data}")
+                    logger.warning("Invalid JSON from client: %s", data)
                 except Exception as e:
-                    logger.error(f"Error processing client message: {e}")
+                    logger.error("Error processing client message: %s", e)
 
         except WebSocketDisconnect:
             logger.info("WebSocket disconnected")
@@ -127,29 +120,38 @@ async def transcript_websocket(websocket: WebSocket):
         except asyncio.CancelledError:
             logger.debug("Client message receiver task cancelled")
         except Exception as e:
-            logger.error(f"Error in client message receiver: {e}")
+            logger.error("Error in client message receiver: %s", e)
             stop_tasks.set()
+        finally:
+            stop_waiter.cancel()
+            recv_waiter.cancel()
 
-    # Run both tasks concurrently
-    sender_task = asyncio.create_task(send_transcript_messages())
-    receiver_task = asyncio.create_task(receive_client_messages())
-
-    try:
-        # Wait for either task to complete (usually due to disconnect)
-        done, pending = await asyncio.wait(
-            [sender_task, receiver_task], return_when=asyncio.FIRST_COMPLETED
-        )
+    async def send_broadcasts(subscriber: asyncio.Queue):
+        """
+        Background task forwarding broadcaster frames to this client.
+        Runs until cancelled or a send fails.
+        """
+        try:
+            while True:
+                frame = await subscriber.get()
+                await websocket.send_bytes(frame)
+        except asyncio.CancelledError:
+            logger.debug("Broadcast sender task cancelled")
+        except Exception as e:
+            logger.error("Error sending transcript batch: %s", e)
+            stop_tasks.set()
 
-        # Cancel any remaining tasks
-        for task in pending:
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+    # Subscribe for batched transcript delivery
+    subscriber = broadcaster.subscribe()
+    sender = asyncio.create_task(send_broadcasts(subscriber))
 
+    try:
+        # Runs until the client disconnects
+        await receive_client_messages()
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
     finally:
         stop_tasks.set()
+        sender.cancel()
+        broadcaster.unsubscribe(subscriber)
         logger.info("WebSocket connection closed")
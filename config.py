@@ -1,4 +1,5 @@
 import os
+from dataclasses import dataclass
 
 from dotenv import load_dotenv
 
@@ -16,12 +17,15 @@ MAX_TURNS = 5  # Total turns before stream ends
 CONTEXT_WINDOW = 6  # How many past messages agents remember
 TOPIC_SWITCH_EVERY = 8  # Switch topic every N turns
 PAUSE_BETWEEN_TURNS = 1  # Seconds of silence between turns
+PARALLEL_ROUNDS = False  # CLI: generate both replies of a round at once
 CHARS_PER_SECOND = 15  # Estimate for audio duration calculation
+TRANSCRIPT_FLUSH_MS = 50  # Coalesce transcript WebSocket messages for this long
 
 # ─── File Paths ──────────────────────────────────────────
 AUDIO_DIR = "audio"
 AVATARS_DIR = "avatars"
 DIALOGUE_HTML = "dialogue.html"
+OVERLAY_JSON = "overlay_data.json"  # Per-turn data polled by dialogue.html
 TRANSCRIPT_FILE = "transcript.txt"
 
 # ─── Agents ──────────────────────────────────────────────
@@ -67,3 +71,61 @@ TOPICS = [
     "Can rapamycin extend human healthspan?",
     "What causes mitochondrial dysfunction in aging?",
 ]
+
+
+# ─── Agent Config (derived) ─────────────────────────────
+@dataclass(frozen=True)
+class AgentCfg:
+    """
+    Per-agent values read on hot paths (avatar swaps, overlay, TTS, prompts).
+
+    Built once from AGENTS at import, so callers use attribute access instead
+    of repeated dict lookups. Image paths are already absolute.
+    """
+
+    name: str
+    color: str
+    voice_id: str
+    idle_path: str
+    small_path: str
+    medium_path: str
+    sys_msg: dict  # {"role": "system", "content": system_prompt}
+
+
+AGENT_CFG = {
+    key: AgentCfg(
+        name=agent["name"],
+        color=agent["color"],
+        voice_id=agent["voice_id"],
+        idle_path=os.path.abspath(agent["avatar_idle"]),
+        small_path=os.path.abspath(agent["avatar_talk_small"]),
+        medium_path=os.path.abspath(agent["avatar_talk_medium"]),
+        sys_msg={"role": "system", "content": agent["system_prompt"]},
+    )
+    for key, agent in AGENTS.items()
+}
+
+
+# ─── Runtime Settings ───────────────────────────────────
+@dataclass(frozen=True)
+class Settings:
+    """
+    Settings that can change at runtime via the API.
+
+    Never mutated in place: updates build a new instance with
+    dataclasses.replace() and rebind SETTINGS, so readers that take a
+    snapshot (s = config.SETTINGS) always see a consistent set of values.
+    """
+
+    max_turns: int
+    pause_between_turns: float
+    topics: tuple[str, ...]
+    transcript_flush_ms: int
+
+
+SETTINGS = Settings(
+    max_turns=MAX_TURNS,
+    pause_between_turns=PAUSE_BETWEEN_TURNS,
+    topics=tuple(TOPICS),
+    transcript_flush_ms=TRANSCRIPT_FLUSH_MS,
+)
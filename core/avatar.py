@@ -7,20 +7,23 @@ How it works:
     2. Sets avatar image based on mouth state
     3. Used by dialogue / TTS logic to animate avatars
 
+Avatar swaps are handed to a single background thread, which only sends the
+latest mouth state per agent, so callers never block on OBS.
+
 Requires:
     - OBS WebSocket plugin enabled
     - pip install obs-websocket-py
 """
 
-import os
 import threading
 import time
 
 from obswebsocket import obsws
 from obswebsocket import requests as obs_requests
 from obswebsocket.exceptions import ConnectionFailure
+from websocket import WebSocketConnectionClosedException
 
-from config import AGENTS
+from config import AGENT_CFG
 from logger import get_logger
 
 logger = get_logger(__name__)
@@ -28,132 +31,225 @@ logger = get_logger(__name__)
 # OBS WebSocket connection
 ws = None
 
+# Serializes ws.call - the sender thread is the only caller in this package,
+# but call_obs is public
+_ws_lock = threading.Lock()
+
+# Seconds of sender-thread inactivity before a keepalive request is sent
+HEARTBEAT_INTERVAL = 30.0
+
+# Absolute image path per (agent_key, mouth)
+_ABS_PATHS = {
+    (key, mouth): path
+    for key, cfg in AGENT_CFG.items()
+    for mouth, path in (
+        ("idle", cfg.idle_path),
+        ("small", cfg.small_path),
+        ("medium", cfg.medium_path),
+    )
+}
+
+# OBS source name per agent
+_SOURCE_NAMES = {key: cfg.name for key, cfg in AGENT_CFG.items()}
+
+# Mouth state OBS is currently showing per agent; updated by the sender thread,
+# cleared whenever the connection is (re)made
+_last_mouth: dict[str, str] = {}
+
+# Latest wanted mouth state per agent not yet sent, consumed by the sender
+# thread. A newer state replaces only the same agent's pending one, so each
+# agent's final state (e.g. idle after a line) is never lost.
+_pending: dict[str, str] = {}
+_pending_cond = threading.Condition()
+_sender_thread: threading.Thread | None = None
+
 
 def connect(max_retries: int = 3, retry_delay: float = 2.0):
     """
-    Connect to OBS WebSocket. Call once at startup.
+    Connect to OBS WebSocket. Call at startup; calling it again (e.g. for a
+    new stream) closes the previous connection first.
 
     Args:
         max_retries: Maximum number of connection attempts
         retry_delay: Delay between retry attempts in seconds
     """
-    global ws
+    global ws, set_avatar
+
+    with _ws_lock:
+        if ws is not None:
+            try:
+                ws.disconnect()
+            except Exception as e:
+                logger.debug("Closing previous OBS WebSocket failed: %s", e)
+            ws = None
+        # OBS may have restarted since; don't skip swaps it no longer shows
+        _last_mouth.clear()
 
     for attempt in range(max_retries):
         try:
             ws = obsws("127.0.0.1", 4455, "")  # host, port, password
             ws.connect()
             logger.info("Connected to OBS via WebSocket")
+            _start_sender()
+            set_avatar = _set_avatar_impl
             return
         except ConnectionFailure as e:
             if attempt < max_retries - 1:
                 logger.warning(
-                    f"OBS WebSocket connection failed (attempt {attempt + 1}/{max_retries}): {e}. "
-                    f"Retrying in {retry_delay}s..."
+                    "OBS WebSocket connection failed (attempt %s/%s): %s. "
+                    "Retrying in %ss...",
+                    attempt + 1,
+                    max_retries,
+                    e,
+                    retry_delay,
                 )
                 time.sleep(retry_delay)
             else:
                 logger.warning(
-                    f"Could not connect to OBS WebSocket after {max_retries} attempts: {e}. "
-                    "Avatar swapping will be disabled."
+                    "Could not connect to OBS WebSocket after %s attempts: %s. "
+                    "Avatar swapping will be disabled.",
+                    max_retries,
+                    e,
                 )
                 ws = None
+                set_avatar = _set_avatar_noop
         except Exception as e:
-            logger.error(f"Unexpected error connecting to OBS WebSocket: {e}")
+            logger.error("Unexpected error connecting to OBS WebSocket: %s", e)
             ws = None
+            set_avatar = _set_avatar_noop
             return
 
 
-def set_avatar(agent_key: str, mouth: str):
+def call_obs(request):
     """
-    Set avatar image in OBS based on mouth state.
+    Issue a blocking OBS WebSocket request.
 
-    agent_key: "agent1" | "agent2"
-    mouth: "idle" | "small" | "medium"
+    If the socket was closed (e.g. OBS restarted), reconnects and retries
+    once so avatar swapping doesn't stay dead for the rest of the stream.
     """
-    if ws is None:
-        # WebSocket not connected - skip silently at DEBUG level
-        logger.debug(f"Skipping avatar swap for {agent_key} (WebSocket not connected)")
+    with _ws_lock:
+        try:
+            return ws.call(request)
+        except (WebSocketConnectionClosedException, ConnectionFailure) as e:
+            logger.warning("OBS WebSocket connection lost (%s), reconnecting...", e)
+            ws.reconnect()
+            # OBS may have restarted with different images; resend everything
+            _last_mouth.clear()
+            return ws.call(request)
+
+
+def _start_sender():
+    """Start the avatar sender thread if it is not already running."""
+    global _sender_thread
+    if _sender_thread is not None and _sender_thread.is_alive():
         return
 
-    agent = AGENTS.get(agent_key)
-    if agent is None:
-        logger.error(f"Invalid agent key: {agent_key}")
+    _sender_thread = threading.Thread(target=_sender_loop, daemon=True)
+    _sender_thread.start()
+
+
+def _sender_loop():
+    """
+    Sole caller of ws.call for avatar swaps.
+
+    Takes the latest wanted mouth state per agent since the last send -
+    intermediate frames are dropped instead of replayed. Sends a keepalive
+    when idle for HEARTBEAT_INTERVAL seconds.
+    """
+    while True:
+        with _pending_cond:
+            if _pending_cond.wait_for(lambda: _pending, timeout=HEARTBEAT_INTERVAL):
+                latest = _pending.copy()
+                _pending.clear()
+            else:
+                latest = None
+
+        if latest is None:
+            _heartbeat()
+            continue
+
+        for agent_key, mouth in latest.items():
+            _send_avatar(agent_key, mouth)
+
+
+def _heartbeat():
+    """Keep the OBS socket warm (and detect a dead one) while no swaps are sent."""
+    if ws is None:
         return
 
-    source_name = agent["name"]
+    try:
+        call_obs(obs_requests.GetVersion())
+        logger.debug("OBS WebSocket heartbeat OK")
+    except Exception as e:
+        logger.warning("OBS WebSocket heartbeat failed: %s", e)
+
+
+def _send_avatar(agent_key: str, mouth: str):
+    """Issue the blocking SetInputSettings call for one avatar swap."""
+    if ws is None:
+        return
 
-    if mouth == "idle":
-        image_path = agent["avatar_idle"]
-    elif mouth == "small":
-        image_path = agent["avatar_talk_small"]
-    elif mouth == "medium":
-        image_path = agent["avatar_talk_medium"]
-    else:
-        logger.warning(f"Invalid mouth state '{mouth}' for {agent_key}")
+    # OBS already shows this image
+    if _last_mouth.get(agent_key) == mouth:
         return
 
+    source_name = _SOURCE_NAMES[agent_key]
+
     try:
-        abs_path = os.path.abspath(image_path)
-        ws.call(
+        call_obs(
             obs_requests.SetInputSettings(
                 inputName=source_name,
-                inputSettings={"file": abs_path},
+                inputSettings={"file": _ABS_PATHS[(agent_key, mouth)]},
                 overlay=True,
             )
         )
-        logger.debug(f"Avatar swapped: {agent_key} → {mouth}")
+        _last_mouth[agent_key] = mouth
+        logger.debug("Avatar swapped: %s → %s", agent_key, mouth)
 
     except Exception as e:
         error_msg = str(e)
         if "No source" in error_msg or "not found" in error_msg.lower():
             logger.error(
-                f"OBS source not found: '{source_name}'. Check OBS scene configuration."
+                "OBS source not found: '%s'. Check OBS scene configuration.",
+                source_name,
             )
         else:
-            logger.warning(f"Avatar swap failed for {agent_key}: {e}")
+            logger.warning("Avatar swap failed for %s: %s", agent_key, e)
 
 
-def set_both_idle():
-    """Set both avatars to idle state."""
-    set_avatar("agent1", "idle")
-    set_avatar("agent2", "idle")
+def _set_avatar_noop(agent_key: str, mouth: str):
+    """Avatar swapping disabled (OBS WebSocket not connected)."""
 
 
-_idle_thread_running = False
+def _set_avatar_impl(agent_key: str, mouth: str):
+    """
+    Set avatar image in OBS based on mouth state.
 
+    Non-blocking: the state is handed to the sender thread. If this agent
+    already has a swap waiting to be sent, it is replaced by this one.
 
-def start_idle_animation(agent_key: str, interval: float = 0.8, movement: int = 2):
-    """
-    Animate small idle motion for an avatar (up/down) in a separate thread.
-    agent_key: "agent1" or "agent2"
-    interval: seconds between movements
-    movement: pixel offset (for overlay, scale, or ignore if simple image swap)
+    agent_key: "agent1" | "agent2"
+    mouth: "idle" | "small" | "medium"
     """
-    global _idle_thread_running
-    if _idle_thread_running:
-        logger.debug(f"Idle animation already running for {agent_key}")
+    if agent_key not in _SOURCE_NAMES:
+        logger.error("Invalid agent key: %s", agent_key)
         return
 
-    _idle_thread_running = True
-    logger.debug(f"Starting idle animation for {agent_key}")
+    if (agent_key, mouth) not in _ABS_PATHS:
+        logger.warning("Invalid mouth state '%s' for %s", mouth, agent_key)
+        return
 
-    def idle_loop():
-        toggle = True
-        while _idle_thread_running:
-            # For simple PNG swap, you could flash between idle images or just do nothing
-            # Here we simply call idle to ensure image stays visible
-            set_avatar(agent_key, "idle")
-            # Could add tiny movement in OBS with WebSocket Transform if desired
-            time.sleep(interval)
-            toggle = not toggle
+    with _pending_cond:
+        _pending[agent_key] = mouth
+        _pending_cond.notify()
 
-    t = threading.Thread(target=idle_loop, daemon=True)
-    t.start()
 
+# Rebound by connect(): the real implementation when OBS is connected, a no-op
+# otherwise. Call it as avatar.set_avatar(...) so the current binding is used.
+set_avatar = _set_avatar_noop
 
-def stop_idle_animation():
-    """Stop all idle animations."""
-    global _idle_thread_running
-    _idle_thread_running = False
-    logger.debug("Stopped idle animations")
+
+def set_both_idle():
+    """Set both avatars to idle state."""
+    set_avatar("agent1", "idle")
+    set_avatar("agent2", "idle")
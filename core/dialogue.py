@@ -1,53 +1,94 @@
-from groq import APIError, Groq, RateLimitError
+import asyncio
+import json
+import threading
+import time
 
-from config import AGENTS, CONTEXT_WINDOW, GROQ_API_KEY, GROQ_MODEL
+from groq import APIError, AsyncGroq, Groq, RateLimitError
+
+from config import AGENT_CFG, CONTEXT_WINDOW, GROQ_API_KEY, GROQ_MODEL
 from logger import get_logger
+from utils.http import pooled_async_client, pooled_client
 from utils.retry import retry_with_backoff
 
 logger = get_logger(__name__)
-client = Groq(api_key=GROQ_API_KEY)
+# Long-lived pooled client so consecutive turns reuse the same connection
+client = Groq(api_key=GROQ_API_KEY, http_client=pooled_client())
+async_client = AsyncGroq(api_key=GROQ_API_KEY, http_client=pooled_async_client())
+
+# Recent conversation so agents remember what was said. Each entry is
+# (speaker_key, own_message, heard_message): the message as the speaker sees
+# it ("assistant") and as the other agent hears it ("user").
+#
+# The window only grows, from CONTEXT_WINDOW up to 2 * CONTEXT_WINDOW - 1
+# messages, and is then cut back to the last CONTEXT_WINDOW. Between cuts,
+# each prompt starts with the same messages as the previous one, so Groq's
+# prompt-prefix cache can be reused (a sliding window shifts the prefix every turn).
+conversation_history: list[tuple[str, dict, dict]] = []
+
+# Guards conversation_history; turns may be generated off the main thread
+_history_lock = threading.Lock()
 
-# Stores the full conversation so agents remember what was said
-conversation_history: list[dict] = []
+# Offline rounds (main.py --offline) go through the Groq Batch API: cheaper,
+# but each batch can take anywhere up to the completion window to finish
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_POLL_INITIAL = 2.0  # Seconds before the first status check
+BATCH_POLL_MAX = 60.0  # Cap on the delay between status checks
+_BATCH_DONE = ("completed", "failed", "expired", "cancelled")
+
+
+def _build_messages(agent_key: str, topic: str) -> list[dict]:
+    """Assemble the chat messages for the given agent's next reply."""
+    agent = AGENT_CFG[agent_key]
+
+    # System prompt defines the agent's personality, followed by recent
+    # history (bounded to avoid hitting token limits) and, last, the
+    # per-turn prompt, so the stable part of the prompt stays a prefix
+    with _history_lock:
+        context = [
+            own if speaker == agent_key else heard
+            for speaker, own, heard in conversation_history
+        ]
+
+    messages = [
+        agent.sys_msg,
+        *context,
+        {
+            "role": "user",
+            "content": f"The current topic is: {topic}. Respond naturally, continuing the discussion.",
+        },
+    ]
+
+    # Log context size for debugging
+    context_size = len(context)
+    logger.debug(
+        "Generating response for %s with %s context messages", agent.name, context_size
+    )
+    return messages
 
 
 @retry_with_backoff(
-    max_retries=3, base_delay=1, exceptions=(RateLimitError, APIError, Exception)
+    max_retries=3,
+    base_delay=1,
+    exceptions=(RateLimitError, APIError, Exception),
+    trip_threshold=5,
 )
-def generate_response(agent_key: str, topic: str) -> str:
+def generate_response(
+    agent_key: str, topic: str, cancelled: threading.Event | None = None
+) -> str:
     """
     Generate a response from the given agent using Groq.
     Maintains conversation context so the agent knows what was said before.
 
     Includes retry logic with exponential backoff for API failures.
     Returns a fallback response if all retries fail.
+
+    If cancelled is set by the time the reply arrives (the caller has
+    stopped waiting for it), the reply is not added to the history.
     """
-    agent = AGENTS[agent_key]
+    agent = AGENT_CFG[agent_key]
 
     try:
-        # System prompt defines the agent's personality
-        messages = [
-            {"role": "system", "content": agent["system_prompt"]},
-        ]
-
-        # Add recent conversation history so the agent has context
-        # We slice to CONTEXT_WINDOW to avoid hitting token limits
-        for entry in conversation_history[-CONTEXT_WINDOW:]:
-            messages.append(entry)
-
-        # The current prompt — tell the agent to continue the discussion
-        messages.append(
-            {
-                "role": "user",
-                "content": f"The current topic is: {topic}. Respond naturally, continuing the discussion.",
-            }
-        )
-
-        # Log context size for debugging
-        context_size = len(conversation_history[-CONTEXT_WINDOW:])
-        logger.debug(
-            f"Generating response for {agent['name']} with {context_size} context messages"
-        )
+        messages = _build_messages(agent_key, topic)
 
         response = client.chat.completions.create(
             messages=messages,
@@ -58,35 +99,213 @@ def generate_response(agent_key: str, topic: str) -> str:
 
         text = response.choices[0].message.content.strip()
 
-        logger.info(f"Generated response from {agent['name']} ({len(text)} chars)")
+        logger.info("Generated response from %s (%s chars)", agent.name, len(text))
 
         # Save to history so the OTHER agent sees this reply next turn
-        # "assistant" = the agent who just spoke
-        # "user"      = the other agent hearing it
-        conversation_history.append({"role": "assistant", "content": text})
+        _remember(agent_key, text, cancelled)
 
         return text
 
     except RateLimitError as e:
-        logger.warning(f"Rate limit hit for {agent['name']}: {e}")
+        logger.warning("Rate limit hit for %s: %s", agent.name, e)
         raise  # Let retry decorator handle it
 
     except APIError as e:
-        logger.error(f"Groq API error for {agent['name']}: {e}")
+        logger.error("Groq API error for %s: %s", agent.name, e)
         # Return fallback response instead of crashing
         fallback = "I need a moment to think about that."
-        conversation_history.append({"role": "assistant", "content": fallback})
+        _remember(agent_key, fallback, cancelled)
         return fallback
 
     except Exception as e:
-        logger.error(f"Unexpected error generating response for {agent['name']}: {e}")
+        logger.error("Unexpected error generating response for %s: %s", agent.name, e)
         # Return fallback response
         fallback = "I need a moment to think about that."
-        conversation_history.append({"role": "assistant", "content": fallback})
+        _remember(agent_key, fallback, cancelled)
         return fallback
 
 
+@retry_with_backoff(
+    max_retries=3,
+    base_delay=1,
+    exceptions=(RateLimitError, APIError, Exception),
+    trip_threshold=5,
+)
+async def _arequest(agent_key: str, messages: list[dict]) -> str:
+    """
+    Send one chat request with AsyncGroq and return the reply text.
+
+    Does not touch the history. Rate limits are retried with backoff (without
+    blocking the event loop); other failures return the fallback response.
+    """
+    agent = AGENT_CFG[agent_key]
+
+    try:
+        response = await async_client.chat.completions.create(
+            messages=messages,
+            model=GROQ_MODEL,
+            temperature=0.8,
+            max_tokens=150,
+        )
+
+        text = response.choices[0].message.content.strip()
+
+        logger.info("Generated response from %s (%s chars)", agent.name, len(text))
+        return text
+
+    except RateLimitError as e:
+        logger.warning("Rate limit hit for %s: %s", agent.name, e)
+        raise
+
+    except APIError as e:
+        logger.error("Groq API error for %s: %s", agent.name, e)
+        # Return fallback response instead of crashing
+        return "I need a moment to think about that."
+
+    except Exception as e:
+        logger.error("Unexpected error generating response for %s: %s", agent.name, e)
+        # Return fallback response
+        return "I need a moment to think about that."
+
+
+async def agenerate_response(agent_key: str, topic: str) -> str:
+    """
+    Async variant of generate_response using AsyncGroq.
+
+    Lets the caller prepare the next turn on the event loop while the
+    current one plays.
+    """
+    text = await _arequest(agent_key, _build_messages(agent_key, topic))
+
+    # Save to history so the OTHER agent sees this reply next turn
+    _remember(agent_key, text)
+    return text
+
+
+async def agenerate_round(agent_keys: list[str], topic: str) -> list[str]:
+    """
+    Generate consecutive turns' replies concurrently.
+
+    Every prompt is built from the same history snapshot, so later speakers
+    in the round don't react to earlier ones; replies are added to the
+    history in turn order once all have arrived.
+    """
+    prompts = [_build_messages(agent_key, topic) for agent_key in agent_keys]
+    texts = await asyncio.gather(
+        *(
+            _arequest(agent_key, messages)
+            for agent_key, messages in zip(agent_keys, prompts)
+        )
+    )
+
+    for agent_key, text in zip(agent_keys, texts):
+        _remember(agent_key, text)
+    return list(texts)
+
+
+def _wait_for_batch(batch_id: str):
+    """Poll a batch with capped exponential backoff until it stops running."""
+    delay = BATCH_POLL_INITIAL
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in _BATCH_DONE:
+            return batch
+        logger.debug(
+            "Batch %s %s, checking again in %.0fs", batch_id, batch.status, delay
+        )
+        time.sleep(delay)
+        delay = min(delay * 2, BATCH_POLL_MAX)
+
+
+def generate_round_batch(agent_keys: list[str], topic: str) -> list[str]:
+    """
+    Generate consecutive turns' replies as a single Groq batch job.
+
+    Prompts are built from the same history snapshot, as in agenerate_round.
+    Blocks until the batch finishes, so this is for offline rendering only;
+    replies missing from the output get the fallback response.
+    """
+    lines = [
+        json.dumps(
+            {
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": GROQ_MODEL,
+                    "messages": _build_messages(agent_key, topic),
+                    "temperature": 0.8,
+                    "max_tokens": 150,
+                },
+            }
+        )
+        for i, agent_key in enumerate(agent_keys)
+    ]
+
+    replies: dict[str, str] = {}
+    try:
+        upload = client.files.create(
+            file=("round.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+        )
+        batch = client.batches.create(
+            completion_window=BATCH_COMPLETION_WINDOW,
+            endpoint="/v1/chat/completions",
+            input_file_id=upload.id,
+        )
+        logger.info("Submitted batch %s (%s requests)", batch.id, len(lines))
+
+        batch = _wait_for_batch(batch.id)
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error("Batch %s ended with status %s", batch.id, batch.status)
+        else:
+            output = client.files.content(batch.output_file_id).text()
+            for line in output.splitlines():
+                result = json.loads(line)
+                body = (result.get("response") or {}).get("body") or {}
+                if body.get("choices"):
+                    content = body["choices"][0]["message"]["content"]
+                    replies[result["custom_id"]] = content.strip()
+
+    except APIError as e:
+        logger.error("Groq batch API error: %s", e)
+
+    texts = []
+    for i, agent_key in enumerate(agent_keys):
+        text = replies.get(str(i))
+        if text is None:
+            text = "I need a moment to think about that."
+        else:
+            logger.info(
+                "Generated response from %s (%s chars)",
+                AGENT_CFG[agent_key].name,
+                len(text),
+            )
+        _remember(agent_key, text)
+        texts.append(text)
+    return texts
+
+
+def _remember(agent_key: str, text: str, cancelled: threading.Event | None = None):
+    """
+    Append a reply to the shared history, unless cancelled is set.
+
+    "assistant" = the agent who just spoke
+    "user"      = the other agent hearing it, prefixed with the speaker's name
+                  so the model can tell who said what
+    """
+    if cancelled is not None and cancelled.is_set():
+        return
+
+    own = {"role": "assistant", "content": text}
+    heard = {"role": "user", "content": f"{AGENT_CFG[agent_key].name}: {text}"}
+    with _history_lock:
+        conversation_history.append((agent_key, own, heard))
+        if len(conversation_history) >= 2 * CONTEXT_WINDOW:
+            del conversation_history[:-CONTEXT_WINDOW]
+
+
 def reset_history():
     """Clear conversation history (e.g. when switching topics)."""
-    conversation_history.clear()
+    with _history_lock:
+        conversation_history.clear()
     logger.debug("Conversation history cleared")
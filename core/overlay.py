@@ -1,30 +1,27 @@
 """
-overlay.py — rewrites dialogue.html every turn.
+overlay.py — drives the dialogue.html subtitle overlay.
 
-OBS Browser Source watches this file and auto-refreshes,
-so the on-stream subtitle updates in real time.
+init_overlay() writes the page once per run; after that, update_overlay()
+only rewrites a small JSON file that the page polls, so the on-stream
+subtitle updates in real time without reloading the OBS Browser Source.
 """
 
-from config import AGENTS, DIALOGUE_HTML
-from logger import get_logger
+import os
+from string import Template
 
-logger = get_logger(__name__)
+import orjson
 
+from config import AGENT_CFG, DIALOGUE_HTML, OVERLAY_JSON
+from logger import get_logger
 
-def update_overlay(agent_key: str, text: str, topic: str):
-    """
-    Rewrite dialogue.html with the current speaker, text, and topic.
-    OBS will pick up the change automatically.
-    """
-    agent = AGENTS[agent_key]
-    color = agent["color"]  # e.g. "#00ff88"
-    name = agent["name"]  # e.g. "Dr. Elena"
+logger = get_logger(__name__)
 
-    # We rebuild the file from scratch each time so animations re-trigger.
-    # This is intentional — OBS re-renders the page on file change,
-    # which restarts CSS animations (slideUp, typeIn, pulse).
+# How often the page checks OVERLAY_JSON for a new turn
+POLL_MS = 150
 
-    html = f"""<!DOCTYPE html>
+# Page shell, written once per run. Per-turn data lives in OVERLAY_JSON, which
+# the page polls, so OBS never re-parses the CSS or re-fetches the fonts.
+_SHELL = Template("""<!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="UTF-8" />
@@ -32,9 +29,9 @@ def update_overlay(agent_key: str, text: str, topic: str):
 <style>
   @import url('https://fonts.googleapis.com/css2?family=IBM+Plex+Mono:wght@400;600&family=Syne:wght@700;800&display=swap');
 
-  *, *::before, *::after {{ box-sizing: border-box; margin: 0; padding: 0; }}
+  *, *::before, *::after { box-sizing: border-box; margin: 0; padding: 0; }
 
-  body {{
+  body {
     background: transparent;
     min-height: 100vh;
     display: flex;
@@ -42,9 +39,9 @@ def update_overlay(agent_key: str, text: str, topic: str):
     justify-content: flex-end;
     padding: 28px 32px;
     font-family: 'IBM Plex Mono', monospace;
-  }}
+  }
 
-  .card {{
+  .card {
     background: rgba(10, 10, 14, 0.88);
     border: 1px solid rgba(255, 255, 255, 0.08);
     border-radius: 16px;
@@ -53,45 +50,49 @@ def update_overlay(agent_key: str, text: str, topic: str):
     width: 100%;
     backdrop-filter: blur(12px);
     box-shadow: 0 8px 40px rgba(0,0,0,0.5);
+    --color: #ffffff;
+  }
+
+  .card.enter {
     animation: slideUp 0.4s cubic-bezier(.22,.61,0,1) both;
-  }}
+  }
 
-  @keyframes slideUp {{
-    from {{ opacity: 0; transform: translateY(24px); }}
-    to   {{ opacity: 1; transform: translateY(0);    }}
-  }}
+  @keyframes slideUp {
+    from { opacity: 0; transform: translateY(24px); }
+    to   { opacity: 1; transform: translateY(0);    }
+  }
 
-  .top-bar {{
+  .top-bar {
     display: flex;
     align-items: center;
     gap: 12px;
     margin-bottom: 14px;
-  }}
+  }
 
-  .speaker-dot {{
+  .speaker-dot {
     width: 10px;
     height: 10px;
     border-radius: 50%;
-    background: {color};
-    box-shadow: 0 0 8px {color};
+    background: var(--color);
+    box-shadow: 0 0 8px var(--color);
     animation: pulse 1.4s ease-in-out infinite;
-  }}
+  }
 
-  @keyframes pulse {{
-    0%, 100% {{ opacity: 1; }}
-    50%      {{ opacity: 0.35; }}
-  }}
+  @keyframes pulse {
+    0%, 100% { opacity: 1; }
+    50%      { opacity: 0.35; }
+  }
 
-  .speaker-name {{
+  .speaker-name {
     font-family: 'Syne', sans-serif;
     font-weight: 800;
     font-size: 18px;
-    color: {color};
+    color: var(--color);
     letter-spacing: 0.5px;
     text-transform: uppercase;
-  }}
+  }
 
-  .live-badge {{
+  .live-badge {
     margin-left: auto;
     background: #e63946;
     color: #fff;
@@ -101,91 +102,203 @@ def update_overlay(agent_key: str, text: str, topic: str):
     text-transform: uppercase;
     padding: 3px 9px;
     border-radius: 20px;
-  }}
+  }
 
-  .dialogue-text {{
+  .dialogue-text {
     color: rgba(255, 255, 255, 0.92);
     font-size: 17px;
     line-height: 1.6;
+  }
+
+  .dialogue-text.enter {
     animation: typeIn 0.6s ease both;
-  }}
+  }
 
-  @keyframes typeIn {{
-    from {{ opacity: 0; transform: translateY(6px); }}
-    to   {{ opacity: 1; transform: translateY(0);   }}
-  }}
+  @keyframes typeIn {
+    from { opacity: 0; transform: translateY(6px); }
+    to   { opacity: 1; transform: translateY(0);   }
+  }
 
-  .topic-bar {{
+  .topic-bar {
     margin-top: 16px;
     padding-top: 12px;
     border-top: 1px solid rgba(255,255,255,0.07);
     display: flex;
     align-items: center;
     gap: 8px;
-  }}
+  }
 
-  .topic-label {{
+  .topic-label {
     color: rgba(255,255,255,0.3);
     font-size: 11px;
     letter-spacing: 1.2px;
     text-transform: uppercase;
-  }}
+  }
 
-  .topic-text {{
+  .topic-text {
     color: rgba(255,255,255,0.55);
     font-size: 13px;
-  }}
+  }
+
+  .card.waiting .top-bar,
+  .card.waiting .topic-bar { display: none; }
+
+  .card.waiting .dialogue-text {
+    color: rgba(255, 255, 255, 0.6);
+    font-size: 16px;
+    text-align: center;
+    padding: 30px;
+  }
 </style>
 </head>
 <body>
-<div class="card">
+<div class="card waiting">
   <div class="top-bar">
     <div class="speaker-dot"></div>
-    <span class="speaker-name">{name}</span>
+    <span class="speaker-name"></span>
     <span class="live-badge">● Live</span>
   </div>
-  <div class="dialogue-text">{text}</div>
+  <div class="dialogue-text">⏳ Starting AI Discussion...</div>
   <div class="topic-bar">
     <span class="topic-label">Topic</span>
-    <span class="topic-text">{topic}</span>
+    <span class="topic-text"></span>
   </div>
 </div>
+<script>
+  const card = document.querySelector('.card');
+  const nameEl = card.querySelector('.speaker-name');
+  const textEl = card.querySelector('.dialogue-text');
+  const topicEl = card.querySelector('.topic-text');
+  let last = null;
+
+  // Re-add a class so its CSS animation plays again without a page reload
+  function replay(el, cls) {
+    el.classList.remove(cls);
+    void el.offsetWidth;
+    el.classList.add(cls);
+  }
+
+  function update(d) {
+    card.style.setProperty('--color', d.color);
+    nameEl.textContent = d.name;
+    textEl.textContent = d.text;
+    topicEl.textContent = d.topic;
+    card.classList.remove('waiting');
+    replay(card, 'enter');
+    replay(textEl, 'enter');
+  }
+
+  setInterval(async () => {
+    try {
+      const d = await (await fetch('${data_file}?t=' + Date.now())).json();
+      if (d.v !== last) {
+        if (d.name) update(d);
+        else if (last !== null) location.reload();  // Reset for a new run
+        last = d.v;
+      }
+    } catch (e) {
+      // Data file missing or mid-replace; try again on the next tick
+    }
+  }, ${poll_ms});
+</script>
 </body>
-</html>"""
+</html>""")
 
-    # Validate HTML content before writing
-    if not html or len(html) < 100:
-        logger.error("Generated HTML is too short or empty")
-        return
 
+# Nothing in the shell changes during a run, so render it once at import
+_SHELL_HTML = _SHELL.substitute(
+    data_file=os.path.basename(OVERLAY_JSON), poll_ms=POLL_MS
+).encode("utf-8")
+# Data file contents before the first turn: the page keeps its waiting card
+_EMPTY_DATA = orjson.dumps({"v": 0})
+
+
+# (agent_key, text, topic) of the last overlay written, to skip identical rewrites
+_last_key: tuple | None = None
+# Bumped on every write so the page can tell a new turn from a re-read
+_version = 0
+
+
+def _write_atomic(path: str, data: bytes) -> bool:
+    """
+    Write data to a temp file and rename it over path, so OBS never
+    reads a half-written file. Returns True on success.
+    """
+    tmp_path = path + ".tmp"
     try:
-        with open(DIALOGUE_HTML, "w", encoding="utf-8") as f:
-            f.write(html)
-        logger.debug(f"Overlay updated for {name}")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+        return True
     except PermissionError as e:
-        logger.critical(f"Permission denied writing overlay file {DIALOGUE_HTML}: {e}")
-        return
+        logger.critical("Permission denied writing overlay file %s: %s", path, e)
     except OSError as e:
-        logger.critical(f"File system error writing overlay file {DIALOGUE_HTML}: {e}")
-        return
+        logger.critical("File system error writing overlay file %s: %s", path, e)
     except Exception as e:
-        logger.error(f"Unexpected error writing overlay file: {e}")
-        return
+        logger.error("Unexpected error writing overlay file: %s", e)
 
-    # Force OBS browser source to refresh via WebSocket
+    # Don't leave a partial temp file next to the overlay
     try:
-        from core.avatar import ws
-
-        if ws is not None:
-            from obswebsocket import requests as obs_requests
-
-            # Press the "Refresh cache" button programmatically
-            ws.call(
-                obs_requests.PressInputPropertiesButton(
-                    inputName="Dialogue", propertyName="refreshnocache"
-                )
-            )
-            logger.debug("OBS browser source refreshed")
-    except Exception as e:
-        # Fail silently if OBS not connected or command fails
-        logger.debug(f"Could not refresh OBS browser source: {e}")
+        os.remove(tmp_path)
+    except OSError:
+        pass
+    return False
+
+
+def _read_bytes(path: str) -> bytes | None:
+    """Return the file's contents, or None if it can't be read."""
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def init_overlay():
+    """
+    Reset the overlay to its waiting card until the first update_overlay()
+    call, writing the page itself only if it is missing or out of date.
+    """
+    global _last_key, _version
+    _last_key = None
+    _version = 0
+    if not _write_atomic(OVERLAY_JSON, _EMPTY_DATA):
+        return
+    # An unchanged page is left alone so OBS doesn't reload it; the empty
+    # data file already sends it back to the waiting card
+    if _read_bytes(DIALOGUE_HTML) != _SHELL_HTML:
+        _write_atomic(DIALOGUE_HTML, _SHELL_HTML)
+    logger.debug("Overlay initialised")
+
+
+def update_overlay(agent_key: str, text: str, topic: str):
+    """
+    Publish the current speaker, text, and topic to the overlay page.
+    The page picks up the change on its next poll.
+
+    Does nothing if the overlay already shows this exact speaker, text and
+    topic, so retries don't replay the entry animation.
+    """
+    global _last_key, _version
+    key = (agent_key, text, topic)
+    if key == _last_key:
+        return
+
+    agent = AGENT_CFG[agent_key]
+    data = {
+        "v": _version + 1,
+        "name": agent.name,
+        "text": text,
+        "topic": topic,
+        "color": agent.color,
+    }
+
+    if _write_atomic(OVERLAY_JSON, orjson.dumps(data)):
+        _version += 1
+        _last_key = key
+        logger.debug("Overlay updated for %s", agent.name)
@@ -1,5 +1,9 @@
+import atexit
+import queue
+import threading
+import time
 from datetime import datetime
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Optional, TextIO
 
 from config import TRANSCRIPT_FILE
 from logger import get_logger
@@ -9,6 +13,23 @@ logger = get_logger(__name__)
 # Callback for real-time transcript broadcasting (WebSocket)
 _broadcast_callback: Optional[Callable[[Dict], None]] = None
 
+# Background writer: lines are queued by log_message and written by one thread
+# that keeps the file open and flushes in batches
+FLUSH_INTERVAL = 0.05  # Seconds between flushes while lines are pending
+FLUSH_EVERY = 64  # Flush immediately once this many lines are pending
+
+_HEADER_RULE = "=" * 50 + "\n\n"
+
+# Last formatted HH:MM:SS and the whole second it was formatted for
+_last_sec = -1
+_last_hms = ""
+
+# Queue of the current writer; each writer gets its own, so a writer that is
+# slow to shut down never takes lines (or the shutdown sentinel) meant for the next
+_write_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+_writer_thread: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
 
 def set_broadcast_callback(callback: Optional[Callable[[Dict], None]]):
     """
@@ -20,27 +41,145 @@ def set_broadcast_callback(callback: Optional[Callable[[Dict], None]]):
     """
     global _broadcast_callback
     _broadcast_callback = callback
-    logger.debug(f"Broadcast callback {'set' if callback else 'cleared'}")
+    logger.debug("Broadcast callback %s", "set" if callback else "cleared")
+
+
+def _writer_loop(f: TextIO, q: "queue.Queue[Optional[str]]"):
+    """Write lines from q to f, flushing every FLUSH_INTERVAL or FLUSH_EVERY lines."""
+    pending = 0
+    last_flush = time.monotonic()
+
+    while True:
+        try:
+            if pending:
+                # Wake up in time to flush what's buffered
+                line = q.get(
+                    timeout=max(0.0, last_flush + FLUSH_INTERVAL - time.monotonic())
+                )
+            else:
+                # Nothing to flush; sleep until the next line
+                line = q.get()
+        except queue.Empty:
+            line = ""
+
+        try:
+            if line is None:
+                # Shutdown sentinel
+                f.flush()
+                f.close()
+                return
+
+            if line:
+                f.write(line)
+                pending += 1
+
+            now = time.monotonic()
+            if pending and (
+                pending >= FLUSH_EVERY or now - last_flush >= FLUSH_INTERVAL
+            ):
+                f.flush()
+                pending = 0
+                last_flush = now
+        except OSError as e:
+            logger.error("File system error writing to transcript file: %s", e)
+        except Exception as e:
+            logger.error("Unexpected error writing to transcript: %s", e)
+
+
+def _start_writer(f: TextIO):
+    """Start the writer thread for an already-open transcript file."""
+    global _writer_thread, _write_queue
+    _write_queue = queue.Queue()
+    _writer_thread = threading.Thread(
+        target=_writer_loop, args=(f, _write_queue), daemon=True
+    )
+    _writer_thread.start()
+
+
+def _open_transcript(mode: str) -> TextIO:
+    # errors="ignore" skips characters that can't be encoded instead of failing the write
+    return open(TRANSCRIPT_FILE, mode, encoding="utf-8", errors="ignore")
+
+
+def close_transcript():
+    """Flush pending transcript lines and close the file (call at stream end)."""
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread is None:
+            return
+        _write_queue.put(None)
+        _writer_thread.join(timeout=2.0)
+        if _writer_thread.is_alive():
+            # Keep it, so no second writer opens the file while it still writes
+            logger.warning(
+                "Transcript writer still busy after 2s, leaving it to finish"
+            )
+            return
+        _writer_thread = None
+
+
+atexit.register(close_transcript)
 
 
 def init_transcript():
     """Create a fresh transcript file with a header."""
+    close_transcript()
+
     try:
-        with open(TRANSCRIPT_FILE, "w", encoding="utf-8") as f:
+        with _writer_lock:
+            if _writer_thread is not None:
+                logger.error(
+                    "Previous transcript writer is still running, "
+                    "not starting a new transcript"
+                )
+                return
+            f = _open_transcript("w")
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            f.write(f"AI Discussion Stream — started {timestamp}\n")
-            f.write("=" * 50 + "\n\n")
-        logger.info(f"Transcript initialized: {TRANSCRIPT_FILE}")
+            f.write(f"AI Discussion Stream — started {timestamp}\n{_HEADER_RULE}")
+            f.flush()
+            _start_writer(f)
+        logger.info("Transcript initialized: %s", TRANSCRIPT_FILE)
     except PermissionError as e:
         logger.error(
-            f"Permission denied creating transcript file {TRANSCRIPT_FILE}: {e}"
+            "Permission denied creating transcript file %s: %s", TRANSCRIPT_FILE, e
         )
     except OSError as e:
         logger.error(
-            f"File system error creating transcript file {TRANSCRIPT_FILE}: {e}"
+            "File system error creating transcript file %s: %s", TRANSCRIPT_FILE, e
         )
     except Exception as e:
-        logger.error(f"Unexpected error creating transcript file: {e}")
+        logger.error("Unexpected error creating transcript file: %s", e)
+
+
+def _ensure_writer() -> bool:
+    """Start a writer appending to the existing transcript if none is running."""
+    # Fast path: the writer (and its open file) normally lives for the session
+    if _writer_thread is not None:
+        return True
+
+    with _writer_lock:
+        if _writer_thread is not None:
+            return True
+        try:
+            _start_writer(_open_transcript("a"))
+            return True
+        except PermissionError as e:
+            logger.error("Permission denied writing to transcript file: %s", e)
+        except OSError as e:
+            logger.error("File system error writing to transcript file: %s", e)
+        return False
+
+
+def _hms(now: float) -> str:
+    """Format now as local HH:MM:SS, reusing the last result within a second."""
+    global _last_sec, _last_hms
+    sec = int(now)
+    if sec != _last_sec:
+        # Assign the string first so a racing reader never pairs the new
+        # second with the old string
+        _last_hms = time.strftime("%H:%M:%S", time.localtime(sec))
+        _last_sec = sec
+    return _last_hms
 
 
 def log_message(agent_name: str, text: str, topic: str | None = None):
@@ -48,24 +187,30 @@ def log_message(agent_name: str, text: str, topic: str | None = None):
     Append a single message to the transcript.
     Optionally logs a topic change marker.
     Also broadcasts to WebSocket subscribers if callback is set.
+
+    The write itself is queued; a background thread batches it to disk.
     """
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    iso_timestamp = datetime.now().isoformat()
+    now = time.time()
+    timestamp = _hms(now)
 
     try:
-        with open(TRANSCRIPT_FILE, "a", encoding="utf-8") as f:
-            if topic:
-                f.write(f"\n📚 [{timestamp}] — Topic: {topic}\n\n")
-            if text:  # Only write message if text is not empty
-                f.write(f"[{timestamp}] {agent_name}: {text}\n")
-        logger.debug(f"Transcript updated: {agent_name}")
+        if not _ensure_writer():
+            return
+
+        # One queued write per call, even when a topic marker precedes the line
+        entry = f"\n📚 [{timestamp}] — Topic: {topic}\n\n" if topic else ""
+        if text:  # Only write message if text is not empty
+            entry += f"[{timestamp}] {agent_name}: {text}\n"
+        if entry:
+            _write_queue.put(entry)
+        logger.debug("Transcript updated: %s", agent_name)
 
         # Broadcast to WebSocket if callback registered
         if _broadcast_callback:
             message = {
                 "type": "transcript",
                 "data": {
-                    "timestamp": iso_timestamp,
+                    "timestamp": datetime.fromtimestamp(now).isoformat(),
                     "agent_name": agent_name,
                     "text": text,
                     "topic": topic,
@@ -74,26 +219,6 @@ def log_message(agent_name: str, text: str, topic: str | None = None):
             try:
                 _broadcast_callback(message)
             except Exception as e:
-                logger.error(f"Error calling broadcast callback: {e}")
-    except PermissionError as e:
-        logger.error(f"Permission denied writing to transcript file: {e}")
-    except OSError as e:
-        logger.error(f"File system error writing to transcript file: {e}")
-    except UnicodeEncodeError as e:
-        # Skip problematic characters and continue
-        logger.warning(
-            f"Encoding error in transcript (skipping problematic characters): {e}"
-        )
-        try:
-            # Retry with error handling for encoding issues
-            with open(TRANSCRIPT_FILE, "a", encoding="utf-8", errors="ignore") as f:
-                if topic:
-                    f.write(f"\n📚 [{timestamp}] — Topic: {topic}\n\n")
-                if text:
-                    f.write(f"[{timestamp}] {agent_name}: {text}\n")
-        except Exception as retry_error:
-            logger.error(
-                f"Failed to write transcript even with error handling: {retry_error}"
-            )
+                logger.error("Error calling broadcast callback: %s", e)
     except Exception as e:
-        logger.error(f"Unexpected error writing to transcript: {e}")
+        logger.error("Unexpected error writing to transcript: %s", e)
@@ -1,39 +1,98 @@
+import asyncio
+import itertools
 import os
 import platform
+import shutil
 import subprocess
+import threading
 import time
+from typing import Iterator
 
-from elevenlabs.client import ElevenLabs
+from elevenlabs.client import AsyncElevenLabs, ElevenLabs
 from elevenlabs.core import ApiError as ElevenLabsAPIError
 
-from config import AGENTS, AUDIO_DIR, CHARS_PER_SECOND, ELEVENLABS_API_KEY
-from core.avatar import set_avatar
+from config import AGENT_CFG, AUDIO_DIR, CHARS_PER_SECOND, ELEVENLABS_API_KEY
+from core import avatar
 from logger import get_logger
+from utils.http import pooled_async_client, pooled_client
 from utils.retry import retry_with_backoff
 
 logger = get_logger(__name__)
 
+# Audio player command for this OS, detected once; the file path is appended.
+# On Windows "start" is a cmd builtin, so it runs through cmd /c.
+_SYSTEM = platform.system()
+if _SYSTEM == "Darwin":
+    _PLAYER_CMD = ["afplay"]
+elif _SYSTEM == "Windows":
+    _PLAYER_CMD = ["cmd", "/c", "start", "/b"]
+else:
+    _PLAYER_CMD = ["ffplay", "-nodisp", "-autoexit"]
+
+# ffplay can play audio piped to stdin while it downloads (afplay can't)
+_STREAM_PLAYER_CMD = [
+    "ffplay",
+    "-nodisp",
+    "-autoexit",
+    "-loglevel",
+    "quiet",
+    "-i",
+    "pipe:0",
+]
+CAN_STREAM_PLAYBACK = shutil.which("ffplay") is not None
+
+# Seconds each mouth frame is shown while talking
+MOUTH_FRAME_INTERVAL = 0.12
+
+
+# Mouth shapes cycled while talking, one per frame
+MOUTH_CYCLE = ("small", "medium", "small")
+
+# Steady-state mouth changes for one pass through MOUTH_CYCLE, as
+# (frame offset, state). Frames repeating the previous shape are left out,
+# so the animation only wakes up (and queues an OBS swap) when the mouth moves.
+_MOUTH_CHANGES = tuple(
+    (i, state) for i, state in enumerate(MOUTH_CYCLE) if state != MOUTH_CYCLE[i - 1]
+)
+
+
+def _mouth_schedule() -> Iterator[tuple[float, str]]:
+    """Yield (seconds from start, state) for each mouth change, indefinitely."""
+    yield 0.0, MOUTH_CYCLE[0]
+    frames = len(MOUTH_CYCLE)
+    for cycle in itertools.count():
+        for i, state in _MOUTH_CHANGES:
+            frame = cycle * frames + i
+            if frame:
+                yield frame * MOUTH_FRAME_INTERVAL, state
+
 
 def animate_mouth(agent_key: str, duration: float):
     """
     Cycle mouth states during speech to simulate talking.
     """
-    states = ["small", "medium", "small", "large"]
-    start = time.time()
-    i = 0
-
-    while time.time() - start < duration:
-        set_avatar(agent_key, states[i % len(states)])
-        time.sleep(0.12)
-        i += 1
+    start = time.monotonic()
+    # Changes are timed against the start, so sleep overshoot doesn't accumulate
+    for offset, state in _mouth_schedule():
+        if offset >= duration:
+            break
+        time.sleep(max(0.0, start + offset - time.monotonic()))
+        avatar.set_avatar(agent_key, state)
 
-    set_avatar(agent_key, "idle")
+    time.sleep(max(0.0, start + duration - time.monotonic()))
+    avatar.set_avatar(agent_key, "idle")
 
 
-client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
+# Long-lived pooled client so consecutive turns reuse the same connection
+client = ElevenLabs(api_key=ELEVENLABS_API_KEY, httpx_client=pooled_client())
+async_client = AsyncElevenLabs(
+    api_key=ELEVENLABS_API_KEY, httpx_client=pooled_async_client()
+)
 
 
-@retry_with_backoff(max_retries=3, base_delay=1, exceptions=(Exception,))
+@retry_with_backoff(
+    max_retries=3, base_delay=1, exceptions=(Exception,), trip_threshold=5
+)
 def text_to_speech(text: str, agent_key: str, filename: str) -> bool:
     """
     Convert text to an audio file using ElevenLabs.
@@ -41,94 +100,264 @@ def text_to_speech(text: str, agent_key: str, filename: str) -> bool:
 
     Includes retry logic with exponential backoff for API failures.
     """
-    agent = AGENTS[agent_key]
+    agent = AGENT_CFG[agent_key]
     filepath = os.path.join(AUDIO_DIR, filename)
 
     try:
         logger.debug(
-            f"Converting text to speech for {agent['name']}: {len(text)} chars"
+            "Converting text to speech for %s: %s chars", agent.name, len(text)
         )
 
         audio_generator = client.text_to_speech.convert(
-            voice_id=agent["voice_id"], text=text, model_id="eleven_turbo_v2_5"
+            voice_id=agent.voice_id, text=text, model_id="eleven_turbo_v2_5"
         )
 
-        # Collect audio bytes from the iterator
-        audio_bytes = b"".join(audio_generator)
-
-        # Write to file
+        # Write chunks as they arrive instead of buffering the whole clip
         with open(filepath, "wb") as f:
-            f.write(audio_bytes)
+            for chunk in audio_generator:
+                f.write(chunk)
 
         # Validate audio file was created successfully
         if not os.path.exists(filepath):
-            logger.error(f"Audio file not created: {filepath}")
+            logger.error("Audio file not created: %s", filepath)
             return False
 
         file_size = os.path.getsize(filepath)
-        logger.info(f"Audio saved: {filename} ({file_size} bytes)")
+        logger.info("Audio saved: %s (%s bytes)", filename, file_size)
         return True
 
     except ElevenLabsAPIError as e:
         # Check if quota exceeded
         if "quota" in str(e).lower():
-            logger.error(f"ElevenLabs quota exceeded: {e}")
+            logger.error("ElevenLabs quota exceeded: %s", e)
             return False
-        logger.error(f"ElevenLabs API error for {agent['name']}: {e}")
+        logger.error("ElevenLabs API error for %s: %s", agent.name, e)
         raise  # Let retry decorator handle other API errors
 
     except OSError as e:
-        logger.critical(f"File system error writing audio file {filepath}: {e}")
+        logger.critical("File system error writing audio file %s: %s", filepath, e)
         return False
 
     except Exception as e:
-        logger.error(f"TTS error for {agent['name']}: {e}")
+        logger.error("TTS error for %s: %s", agent.name, e)
         raise  # Let retry decorator handle it
 
 
-def play_audio(filename: str, agent_key: str, text: str) -> float:
+@retry_with_backoff(
+    max_retries=3, base_delay=1, exceptions=(Exception,), trip_threshold=5
+)
+async def atext_to_speech(text: str, agent_key: str, filename: str) -> bool:
     """
-    Play an audio file AND animate avatar mouth simultaneously.
-    Works on macOS, Windows, Linux.
+    Async variant of text_to_speech using AsyncElevenLabs.
+
+    Audio chunks are awaited from the network and written as they arrive,
+    so the event loop stays free during synthesis, and retries back off
+    without blocking it.
+    Returns True if successful, False otherwise.
     """
+    agent = AGENT_CFG[agent_key]
     filepath = os.path.join(AUDIO_DIR, filename)
 
-    if not os.path.exists(filepath):
-        logger.warning(f"Audio file not found: {filepath}")
-        return 0.0
+    try:
+        logger.debug(
+            "Converting text to speech for %s: %s chars", agent.name, len(text)
+        )
 
-    duration = estimate_duration(text)
-    logger.debug(f"Playing audio: {filename} (estimated {duration:.1f}s)")
+        audio_stream = async_client.text_to_speech.convert(
+            voice_id=agent.voice_id, text=text, model_id="eleven_turbo_v2_5"
+        )
 
-    # Thread for mouth animation
-    import threading
+        with open(filepath, "wb") as f:
+            async for chunk in audio_stream:
+                f.write(chunk)
 
-    stop_animation = threading.Event()
+        file_size = os.path.getsize(filepath)
+        logger.info("Audio saved: %s (%s bytes)", filename, file_size)
+        return True
+
+    except ElevenLabsAPIError as e:
+        # Check if quota exceeded
+        if "quota" in str(e).lower():
+            logger.error("ElevenLabs quota exceeded: %s", e)
+            return False
+        logger.error("ElevenLabs API error for %s: %s", agent.name, e)
+        raise
+
+    except OSError as e:
+        logger.critical("File system error writing audio file %s: %s", filepath, e)
+        return False
+
+    except Exception as e:
+        logger.error("TTS error for %s: %s", agent.name, e)
+        raise
+
+
+@retry_with_backoff(
+    max_retries=3, base_delay=1, exceptions=(Exception,), trip_threshold=5
+)
+def synthesize(text: str, agent_key: str) -> bytes | None:
+    """
+    Convert text to MP3 audio in memory using ElevenLabs.
+    Returns the clip, or None if it could not be produced.
+
+    Includes retry logic with exponential backoff for API failures.
+    """
+    agent = AGENT_CFG[agent_key]
 
-    def mouth_loop():
-        states = ["small", "medium", "small"]
-        i = 0
-        while not stop_animation.is_set():
-            set_avatar(agent_key, states[i % len(states)])
-            i += 1
-            time.sleep(0.12)
-        set_avatar(agent_key, "idle")
+    try:
+        logger.debug(
+            "Converting text to speech for %s: %s chars", agent.name, len(text)
+        )
+
+        audio = b"".join(
+            client.text_to_speech.convert(
+                voice_id=agent.voice_id, text=text, model_id="eleven_turbo_v2_5"
+            )
+        )
+
+        if not audio:
+            logger.error("No audio returned for %s", agent.name)
+            return None
+
+        logger.info("Audio synthesized for %s (%s bytes)", agent.name, len(audio))
+        return audio
+
+    except ElevenLabsAPIError as e:
+        # Check if quota exceeded
+        if "quota" in str(e).lower():
+            logger.error("ElevenLabs quota exceeded: %s", e)
+            return None
+        logger.error("ElevenLabs API error for %s: %s", agent.name, e)
+        raise  # Let retry decorator handle other API errors
+
+    except Exception as e:
+        logger.error("TTS error for %s: %s", agent.name, e)
+        raise  # Let retry decorator handle it
+
+
+@retry_with_backoff(
+    max_retries=3, base_delay=1, exceptions=(Exception,), trip_threshold=5
+)
+async def asynthesize(text: str, agent_key: str) -> bytes | None:
+    """
+    Async variant of synthesize using AsyncElevenLabs.
+
+    Retries back off without blocking the event loop.
+    """
+    agent = AGENT_CFG[agent_key]
+
+    try:
+        logger.debug(
+            "Converting text to speech for %s: %s chars", agent.name, len(text)
+        )
+
+        audio_stream = async_client.text_to_speech.convert(
+            voice_id=agent.voice_id, text=text, model_id="eleven_turbo_v2_5"
+        )
+        audio = b"".join([chunk async for chunk in audio_stream])
+
+        if not audio:
+            logger.error("No audio returned for %s", agent.name)
+            return None
+
+        logger.info("Audio synthesized for %s (%s bytes)", agent.name, len(audio))
+        return audio
+
+    except ElevenLabsAPIError as e:
+        # Check if quota exceeded
+        if "quota" in str(e).lower():
+            logger.error("ElevenLabs quota exceeded: %s", e)
+            return None
+        logger.error("ElevenLabs API error for %s: %s", agent.name, e)
+        raise
+
+    except Exception as e:
+        logger.error("TTS error for %s: %s", agent.name, e)
+        raise
 
-    t = threading.Thread(target=mouth_loop)
+
+def render_speech(text: str, agent_key: str, filename: str) -> bytes | str | None:
+    """
+    Synthesize text into something play_audio accepts.
+
+    With ffplay the clip stays in memory and is piped to the player, so
+    nothing touches the disk; otherwise (afplay can't read stdin) it is saved
+    as filename in AUDIO_DIR and that name is returned. None on failure.
+    """
+    if CAN_STREAM_PLAYBACK:
+        return synthesize(text, agent_key)
+    return filename if text_to_speech(text, agent_key, filename) else None
+
+
+async def arender_speech(
+    text: str, agent_key: str, filename: str
+) -> bytes | str | None:
+    """Async variant of render_speech, for play_audio_async."""
+    if CAN_STREAM_PLAYBACK:
+        return await asynthesize(text, agent_key)
+    return filename if await atext_to_speech(text, agent_key, filename) else None
+
+
+def _mouth_loop(agent_key: str, stop_animation: threading.Event):
+    """Animate the mouth until stop_animation is set, then return to idle."""
+    start = time.monotonic()
+    for offset, state in _mouth_schedule():
+        # Wait on the event so stopping wakes the loop immediately
+        if stop_animation.wait(max(0.0, start + offset - time.monotonic())):
+            break
+        avatar.set_avatar(agent_key, state)
+    avatar.set_avatar(agent_key, "idle")
+
+
+def _start_mouth_animation(agent_key: str) -> tuple[threading.Event, threading.Thread]:
+    """Start the mouth animation thread; set the returned event to stop it."""
+    stop_animation = threading.Event()
+    t = threading.Thread(target=_mouth_loop, args=(agent_key, stop_animation))
     t.start()
+    return stop_animation, t
+
+
+def _player_args(audio: bytes | str) -> tuple[list[str], bytes | None] | None:
+    """
+    Player command line and stdin data for a clip from render_speech, or
+    None if the clip's file is missing.
+    """
+    if isinstance(audio, bytes):
+        return _STREAM_PLAYER_CMD, audio
+
+    filepath = os.path.join(AUDIO_DIR, audio)
+    if not os.path.exists(filepath):
+        logger.warning("Audio file not found: %s", filepath)
+        return None
+    return [*_PLAYER_CMD, filepath], None
+
+
+def play_audio(audio: bytes | str, agent_key: str, text: str) -> float:
+    """
+    Play audio AND animate avatar mouth simultaneously.
+    Works on macOS, Windows, Linux.
+
+    audio is a file name in AUDIO_DIR, or the clip itself as bytes, which
+    is piped to ffplay (see render_speech).
+    """
+    args = _player_args(audio)
+    if args is None:
+        return 0.0
+    cmd, data = args
+    label = audio if data is None else "in-memory clip"
+
+    duration = estimate_duration(text)
+    logger.debug("Playing audio: %s (estimated %.1fs)", label, duration)
+
+    # Thread for mouth animation
+    stop_animation, t = _start_mouth_animation(agent_key)
 
     # Play audio (blocking)
-    system = platform.system()
     try:
-        if system == "Darwin":
-            subprocess.call(["afplay", filepath])
-        elif system == "Windows":
-            subprocess.Popen(["start", "/b", filepath], shell=True).wait()
-        else:
-            subprocess.call(["ffplay", "-nodisp", "-autoexit", filepath])
-        logger.debug(f"Audio playback completed: {filename}")
+        subprocess.run(cmd, input=data)
+        logger.debug("Audio playback completed: %s", label)
     except Exception as e:
-        logger.error(f"Playback error for {filename}: {e}")
+        logger.error("Playback error for %s: %s", label, e)
 
     # Stop mouth animation
     stop_animation.set()
@@ -137,6 +366,119 @@ def play_audio(filename: str, agent_key: str, text: str) -> float:
     return duration
 
 
+async def play_audio_async(audio: bytes | str, agent_key: str, text: str) -> float:
+    """
+    Async variant of play_audio for callers running on an event loop.
+
+    The player runs as an asyncio subprocess, so the loop stays free while
+    the clip plays. The player is killed if the caller is cancelled.
+    """
+    args = _player_args(audio)
+    if args is None:
+        return 0.0
+    cmd, data = args
+    label = audio if data is None else "in-memory clip"
+
+    duration = estimate_duration(text)
+    logger.debug("Playing audio: %s (estimated %.1fs)", label, duration)
+
+    stop_animation, t = _start_mouth_animation(agent_key)
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=None if data is None else subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            await proc.communicate(data)
+        except asyncio.CancelledError:
+            proc.kill()
+            raise
+        logger.debug("Audio playback completed: %s", label)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error("Playback error for %s: %s", label, e)
+    finally:
+        # Stop mouth animation
+        stop_animation.set()
+
+    await asyncio.to_thread(t.join, 0.5)
+
+    return duration
+
+
+async def astream_tts_and_play(text: str, agent_key: str) -> bool:
+    """
+    Synthesize text with ElevenLabs and play it while it downloads.
+
+    Chunks from the streaming endpoint are piped straight into ffplay, so
+    playback starts with the first chunk instead of after the whole clip is
+    saved. Nothing is written to disk. Requires ffplay (CAN_STREAM_PLAYBACK).
+    Returns True if any audio was played, False otherwise.
+    """
+    agent = AGENT_CFG[agent_key]
+    logger.debug("Streaming speech for %s: %s chars", agent.name, len(text))
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *_STREAM_PLAYER_CMD,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError as e:
+        logger.error("Could not start streaming player: %s", e)
+        return False
+
+    stop_animation = None
+    t = None
+
+    try:
+        audio_stream = async_client.text_to_speech.stream(
+            voice_id=agent.voice_id, text=text, model_id="eleven_turbo_v2_5"
+        )
+        async for chunk in audio_stream:
+            if t is None:
+                # Start talking with the first audio that reaches the player
+                stop_animation, t = _start_mouth_animation(agent_key)
+            proc.stdin.write(chunk)
+            await proc.stdin.drain()
+
+    except asyncio.CancelledError:
+        proc.kill()
+        raise
+    except ElevenLabsAPIError as e:
+        logger.error("ElevenLabs API error for %s: %s", agent.name, e)
+    except Exception as e:
+        logger.error("Streaming TTS error for %s: %s", agent.name, e)
+
+    try:
+        if t is None:
+            # Nothing to play
+            proc.kill()
+        else:
+            # Let the player finish whatever it has received
+            proc.stdin.close()
+        await proc.wait()
+        logger.debug("Streamed playback completed for %s", agent.name)
+    except asyncio.CancelledError:
+        proc.kill()
+        raise
+    except Exception as e:
+        logger.error("Playback error while streaming for %s: %s", agent.name, e)
+    finally:
+        if stop_animation is not None:
+            stop_animation.set()
+
+    if t is not None:
+        await asyncio.to_thread(t.join, 0.5)
+
+    return t is not None
+
+
 def estimate_duration(text: str) -> float:
     """Rough estimate of how long the audio will be based on character count."""
     return len(text) / CHARS_PER_SECOND
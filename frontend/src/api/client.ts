@@ -44,14 +44,23 @@ export const createWebSocket = (onMessage: (data: WebSocketMessage) => void) =>
   const wsUrl = `${wsHost}/ws/transcript`;
 
   const ws = new WebSocket(wsUrl);
+  // All server messages arrive as binary UTF-8 JSON frames
+  ws.binaryType = 'arraybuffer';
+  const decoder = new TextDecoder();
 
   ws.onopen = () => {
     console.log('WebSocket connected');
   };
 
   ws.onmessage = (event) => {
-    const data = JSON.parse(event.data) as WebSocketMessage;
-    onMessage(data);
+    // Broadcast updates arrive as a transcript_batch; direct replies are single messages
+    const raw = typeof event.data === 'string' ? event.data : decoder.decode(event.data);
+    const data = JSON.parse(raw) as WebSocketMessage;
+    if (data.type === 'transcript_batch') {
+      data.items?.forEach(onMessage);
+    } else {
+      onMessage(data);
+    }
   };
 
   ws.onerror = (error) => {
@@ -24,9 +24,10 @@ export interface TranscriptMessage {
 }
 
 export interface WebSocketMessage {
-  type: 'connection' | 'transcript' | 'topic_change' | 'status';
+  type: 'connection' | 'transcript' | 'topic_change' | 'status' | 'transcript_batch';
   message?: string;
   data?: TranscriptMessage | StreamStatus;
+  items?: WebSocketMessage[];
 }
 
 export interface ConfigUpdate {
@@ -27,12 +27,21 @@ LOG_FILE = os.path.join(LOGS_DIR, "app.log")
 MAX_BYTES = 10 * 1024 * 1024  # 10 MB per log file
 BACKUP_COUNT = 5  # Keep up to 5 rotated log files
 
+# Logger that owns the handlers; module loggers are its children. Kept off the
+# Python root logger so third-party libraries' records aren't picked up.
+APP_LOGGER_NAME = "ai-avatar-stream"
+
 
 def setup_logger(
     name: Optional[str] = None, level: int = logging.INFO
 ) -> logging.Logger:
     """
-    Configure and return a logger with console and file handlers.
+    Configure and return a logger.
+
+    Only the application logger owns the console and file handlers. Any
+    other name gets a child of it with no handlers of its own, so every
+    record goes through the one set of handlers (a single RotatingFileHandler
+    on app.log, however many modules log).
 
     Args:
         name: Logger name (typically __name__ of the calling module)
@@ -41,8 +50,12 @@ def setup_logger(
     Returns:
         Configured logger instance
     """
-    logger_name = name or "ai-avatar-stream"
-    logger = logging.getLogger(logger_name)
+    if name and name != APP_LOGGER_NAME:
+        child = logging.getLogger(f"{APP_LOGGER_NAME}.{name}")
+        child.setLevel(level)
+        return child
+
+    logger = logging.getLogger(APP_LOGGER_NAME)
 
     # Avoid adding handlers multiple times if logger already configured
     if logger.handlers:
@@ -100,12 +113,13 @@ def setup_logger(
 
 
 # Create default logger for the application
-logger = setup_logger("ai-avatar-stream", level=logging.INFO)
+logger = setup_logger(APP_LOGGER_NAME, level=logging.INFO)
 
 
 def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """
-    Get a logger for a specific module.
+    Get a logger for a specific module. Its records are emitted by the
+    application logger's handlers.
 
     Args:
         name: Module name (use __name__)
@@ -1,42 +1,127 @@
+import argparse
+import asyncio
 import os
 import random
-import time
+from collections import deque
 from datetime import datetime
 
 from config import (
-    AGENTS,
+    AGENT_CFG,
     AUDIO_DIR,
     MAX_TURNS,
+    PARALLEL_ROUNDS,
     PAUSE_BETWEEN_TURNS,
     TOPIC_SWITCH_EVERY,
     TOPICS,
 )
 from core.avatar import connect as connect_obs
-from core.avatar import set_avatar, set_both_idle
-from core.dialogue import generate_response, reset_history
-from core.overlay import update_overlay
-from core.transcript import init_transcript, log_message
-from core.tts import estimate_duration, play_audio, text_to_speech
+from core.avatar import set_both_idle
+from core.dialogue import (
+    agenerate_response,
+    agenerate_round,
+    generate_round_batch,
+    reset_history,
+)
+from core.overlay import init_overlay, update_overlay
+from core.transcript import close_transcript, init_transcript, log_message
+from core.tts import (
+    CAN_STREAM_PLAYBACK,
+    arender_speech,
+    astream_tts_and_play,
+    atext_to_speech,
+    estimate_duration,
+    play_audio_async,
+)
 from logger import get_logger
 
 logger = get_logger(__name__)
 
 
-def main():
+async def prepare_turn(turn: int, topic: str) -> tuple[str, str, str, bool]:
     """
-    Main entry point for the AI avatar discussion stream.
+    Generate the reply and audio for one turn.
 
-    Orchestrates the entire conversation flow, including:
-    - Setting up directories and connections
-    - Generating responses from agents
-    - Converting text to speech
-    - Animating avatars
-    - Managing topic switches
+    Uses the async Groq and ElevenLabs clients, so the next turn can be
+    prepared on the event loop while the current one is playing.
+
+    Returns:
+        (agent_key, text, audio, tts_ok), where audio is what
+        play_audio_async takes (see arender_speech)
+    """
+    # Alternate speakers: even turns → agent2, odd → agent1
+    agent_key = "agent2" if turn % 2 == 0 else "agent1"
+    logger.info(
+        "Turn %s/%s: %s thinking...", turn + 1, MAX_TURNS, AGENT_CFG[agent_key].name
+    )
+
+    # 1. Generate reply
+    text = await agenerate_response(agent_key, topic)
+
+    # 2. Speech
+    audio = await arender_speech(text, agent_key, f"turn_{turn}.mp3")
+    return agent_key, text, audio, audio is not None
+
+
+async def prepare_turns(turn: int, topic: str) -> list[tuple[str, str, str, bool]]:
+    """
+    Prepare the next turn, or the next two at once when PARALLEL_ROUNDS is on.
+
+    In parallel mode both agents' replies are generated concurrently from
+    the same history and their audio is synthesized concurrently; playback
+    still happens in turn order. A round never spans a topic switch.
+    """
+    if not PARALLEL_ROUNDS or turn + 1 >= MAX_TURNS or _switches_topic_after(turn):
+        return [await prepare_turn(turn, topic)]
+
+    turns = (turn, turn + 1)
+    agent_keys = ["agent2" if t % 2 == 0 else "agent1" for t in turns]
+    logger.info(
+        "Turns %s-%s/%s: both agents thinking...", turn + 1, turn + 2, MAX_TURNS
+    )
+
+    texts = await agenerate_round(agent_keys, topic)
+    audios = await asyncio.gather(
+        *(
+            arender_speech(text, agent_key, f"turn_{t}.mp3")
+            for t, text, agent_key in zip(turns, texts, agent_keys)
+        )
+    )
+    return [
+        (agent_key, text, audio, audio is not None)
+        for agent_key, text, audio in zip(agent_keys, texts, audios)
+    ]
+
+
+def _switches_topic_after(turn: int) -> bool:
+    """Whether the topic changes once this turn has played."""
+    return (turn + 1) % TOPIC_SWITCH_EVERY == 0 and turn < MAX_TURNS - 2
+
+
+def _other_topic_idx(topic_idx: int) -> int:
+    """
+    Pick a different random topic index. Steps a random non-zero distance
+    round the list, so no filtered list has to be built.
+    """
+    step = random.randrange(1, len(TOPICS))
+    return (topic_idx + step) % len(TOPICS)
+
+
+async def run_discussion():
+    """
+    Run the discussion as a pipeline: while one turn's audio plays, the next
+    turn's reply and audio are already being generated.
+
+    Turns are not prepared ahead across a topic switch, since the next turn
+    needs the new topic and a cleared history.
     """
     start_time = datetime.now()
     successful_turns = 0
     failed_turns = 0
 
+    # Prepared-ahead turn(s), if in flight, and prepared turns not yet played
+    next_task: asyncio.Task | None = None
+    ready: deque = deque()
+
     try:
         logger.info("=" * 60)
         logger.info("AI Avatar Discussion Stream - Starting")
@@ -44,24 +129,18 @@ def main():
 
         # ── Ensure directories exist ──────────────────────
         os.makedirs(AUDIO_DIR, exist_ok=True)
-        logger.debug(f"Audio directory ready: {AUDIO_DIR}")
+        logger.debug("Audio directory ready: %s", AUDIO_DIR)
 
         # ── Fresh transcript ──────────────────────────────
         init_transcript()
 
-        # ── Connect to OBS for avatar swapping ───────────
-        connect_obs()
-        set_both_idle()
-
-        # Start subtle idle motion for both avatars
-        from core.avatar import start_idle_animation
-
-        start_idle_animation("agent1")
-        start_idle_animation("agent2")
+        # ── Overlay page (written once, then fed per turn) ─
+        init_overlay()
 
         # ── Pick a starting topic ─────────────────────────
-        current_topic = random.choice(TOPICS)
-        logger.info(f"Starting topic: {current_topic}")
+        topic_idx = random.randrange(len(TOPICS))
+        current_topic = TOPICS[topic_idx]
+        logger.info("Starting topic: %s", current_topic)
 
         # ── Opening line (agent1 introduces the topic) ───
         opening_text = (
@@ -69,73 +148,97 @@ def main():
             f"{current_topic} Let's dive in."
         )
 
+        opener_name = AGENT_CFG["agent1"].name
         audio_file = "opening.mp3"
-        logger.info(f"{AGENTS['agent1']['name']}: {opening_text}")
 
-        if text_to_speech(opening_text, "agent1", audio_file):
+        # Start on the opening audio (or, when it will be streamed, the first
+        # reply) while the OBS handshake runs in a worker thread
+        if CAN_STREAM_PLAYBACK:
+            next_task = asyncio.create_task(prepare_turns(0, current_topic))
+        else:
+            opening_task = asyncio.create_task(
+                atext_to_speech(opening_text, "agent1", audio_file)
+            )
+
+        # ── Connect to OBS for avatar swapping ───────────
+        await asyncio.to_thread(connect_obs)
+        # OBS holds the idle image until the next swap, so nothing has to
+        # keep re-sending it
+        set_both_idle()
+
+        logger.info("%s: %s", opener_name, opening_text)
+
+        if CAN_STREAM_PLAYBACK:
+            # Nothing is playing yet to hide the synthesis behind, so stream
+            # the opening straight into the player
+            update_overlay("agent1", opening_text, current_topic)
+            log_message(opener_name, opening_text, topic=current_topic)
+            if await astream_tts_and_play(opening_text, "agent1"):
+                await asyncio.sleep(PAUSE_BETWEEN_TURNS)
+            else:
+                logger.warning("Failed to stream opening audio, continuing anyway")
+        elif await opening_task:
             update_overlay("agent1", opening_text, current_topic)
-            log_message(AGENTS["agent1"]["name"], opening_text, topic=current_topic)
-            play_audio(audio_file, "agent1", opening_text)
-            time.sleep(PAUSE_BETWEEN_TURNS)
+            log_message(opener_name, opening_text, topic=current_topic)
+            # Prepare the first reply while the opening plays
+            next_task = asyncio.create_task(prepare_turns(0, current_topic))
+            await play_audio_async(audio_file, "agent1", opening_text)
+            await asyncio.sleep(PAUSE_BETWEEN_TURNS)
         else:
             logger.warning("Failed to generate opening audio, continuing anyway")
 
         # ── Main loop ─────────────────────────────────────
         for turn in range(MAX_TURNS):
             try:
-                # Alternate speakers: even turns → agent2, odd → agent1
-                agent_key = "agent2" if turn % 2 == 0 else "agent1"
-                agent = AGENTS[agent_key]
-
-                logger.info(f"Turn {turn + 1}/{MAX_TURNS}: {agent['name']} thinking...")
-
-                # 1. Generate reply
-                text = generate_response(agent_key, current_topic)
+                if not ready:
+                    if next_task is None:
+                        next_task = asyncio.create_task(
+                            prepare_turns(turn, current_topic)
+                        )
+                    task, next_task = next_task, None
+                    ready.extend(await task)
+                agent_key, text, audio, success = ready.popleft()
+                name = AGENT_CFG[agent_key].name
+
+                # Start on the following turn(s) while this one plays
+                switching = _switches_topic_after(turn)
+                if not ready and turn + 1 < MAX_TURNS and not switching:
+                    next_task = asyncio.create_task(
+                        prepare_turns(turn + 1, current_topic)
+                    )
 
-                # 2. Speech
-                audio_file = f"turn_{turn}.mp3"
-                success = text_to_speech(text, agent_key, audio_file)
                 if not success:
-                    logger.warning(f"Turn {turn + 1} skipped - TTS failed")
+                    logger.warning("Turn %s skipped - TTS failed", turn + 1)
                     failed_turns += 1
                     continue
 
                 # 3. Overlay + transcript
                 update_overlay(agent_key, text, current_topic)
-                log_message(agent["name"], text)
+                log_message(name, text)
 
                 # 4. Print + play
-                logger.info(f"{agent['name']}: {text}")
-                play_audio(audio_file, agent_key, text)
+                logger.info("%s: %s", name, text)
+                await play_audio_async(audio, agent_key, text)
 
                 successful_turns += 1
 
-                # Wait for a short pause (audio already finished - afplay is blocking)
-                time.sleep(PAUSE_BETWEEN_TURNS)
+                # Wait for a short pause (audio already finished - playback is awaited)
+                await asyncio.sleep(PAUSE_BETWEEN_TURNS)
 
                 # ── Topic switch every N turns ──────────────
-                if (turn + 1) % TOPIC_SWITCH_EVERY == 0 and turn < MAX_TURNS - 2:
-                    current_topic = random.choice(
-                        [t for t in TOPICS if t != current_topic]
-                    )
+                if switching:
+                    topic_idx = _other_topic_idx(topic_idx)
+                    current_topic = TOPICS[topic_idx]
                     reset_history()
-                    logger.info(f"Topic switched to: {current_topic}")
+                    logger.info("Topic switched to: %s", current_topic)
                     log_message("", "", topic=current_topic)
-                    time.sleep(1)
+                    await asyncio.sleep(1)
 
-            except KeyboardInterrupt:
-                logger.warning("Stream interrupted by user")
-                raise
             except Exception as e:
-                logger.error(f"Error in turn {turn + 1}: {e}", exc_info=True)
+                logger.error("Error in turn %s: %s", turn + 1, e, exc_info=True)
                 failed_turns += 1
                 # Continue to next turn instead of crashing
 
-        # ── Stop idle animation ──────────────────────────
-        from core.avatar import stop_idle_animation
-
-        stop_idle_animation()
-
         # ── Summary statistics ──────────────────────────
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
@@ -143,20 +246,131 @@ def main():
 
         logger.info("=" * 60)
         logger.info("Discussion finished!")
-        logger.info(f"Duration: {duration:.1f}s")
+        logger.info("Duration: %.1fs", duration)
         logger.info(
-            f"Successful turns: {successful_turns}/{MAX_TURNS} ({success_rate:.1f}%)"
+            "Successful turns: %s/%s (%.1f%%)",
+            successful_turns,
+            MAX_TURNS,
+            success_rate,
         )
-        logger.info(f"Failed turns: {failed_turns}")
-        logger.info(f"Transcript saved to: transcript.txt")
+        logger.info("Failed turns: %s", failed_turns)
+        logger.info("Transcript saved to: transcript.txt")
         logger.info("=" * 60)
 
+    finally:
+        if next_task is not None:
+            next_task.cancel()
+
+
+async def render_offline():
+    """
+    Pre-render the discussion for later playback (--offline).
+
+    Each round's replies come from one Groq batch job (cheaper than realtime
+    calls, but a batch may take a while to complete) and their audio is then
+    synthesized concurrently. Writes the audio files and transcript only;
+    OBS, the overlay and playback are not touched.
+    """
+    start_time = datetime.now()
+    rendered_turns = 0
+
+    logger.info("=" * 60)
+    logger.info("AI Avatar Discussion - Offline Render")
+    logger.info("=" * 60)
+
+    os.makedirs(AUDIO_DIR, exist_ok=True)
+    init_transcript()
+
+    topic_idx = random.randrange(len(TOPICS))
+    current_topic = TOPICS[topic_idx]
+    logger.info("Starting topic: %s", current_topic)
+
+    opening_text = (
+        f"Welcome, everyone! Today we're going to explore a fascinating question: "
+        f"{current_topic} Let's dive in."
+    )
+    if await atext_to_speech(opening_text, "agent1", "opening.mp3"):
+        log_message(AGENT_CFG["agent1"].name, opening_text, topic=current_topic)
+    else:
+        logger.warning("Failed to generate opening audio, continuing anyway")
+
+    turn = 0
+    while turn < MAX_TURNS:
+        # A round is both agents' next replies, never spanning a topic switch
+        if turn + 1 >= MAX_TURNS or _switches_topic_after(turn):
+            turns = [turn]
+        else:
+            turns = [turn, turn + 1]
+        agent_keys = ["agent2" if t % 2 == 0 else "agent1" for t in turns]
+        logger.info(
+            "Turns %s-%s/%s: submitting batch...", turn + 1, turns[-1] + 1, MAX_TURNS
+        )
+
+        texts = await asyncio.to_thread(generate_round_batch, agent_keys, current_topic)
+        audio_files = [f"turn_{t}.mp3" for t in turns]
+        results = await asyncio.gather(
+            *(
+                atext_to_speech(text, agent_key, audio_file)
+                for text, agent_key, audio_file in zip(texts, agent_keys, audio_files)
+            ),
+            return_exceptions=True,
+        )
+
+        for t, agent_key, text, ok in zip(turns, agent_keys, texts, results):
+            if ok is True:
+                log_message(AGENT_CFG[agent_key].name, text)
+                rendered_turns += 1
+            else:
+                logger.warning("Turn %s skipped - TTS failed", t + 1)
+
+        if _switches_topic_after(turns[-1]):
+            topic_idx = _other_topic_idx(topic_idx)
+            current_topic = TOPICS[topic_idx]
+            reset_history()
+            logger.info("Topic switched to: %s", current_topic)
+            log_message("", "", topic=current_topic)
+
+        turn += len(turns)
+
+    duration = (datetime.now() - start_time).total_seconds()
+    logger.info("=" * 60)
+    logger.info("Offline render finished in %.1fs", duration)
+    logger.info("Rendered turns: %s/%s", rendered_turns, MAX_TURNS)
+    logger.info("Audio saved to: %s", AUDIO_DIR)
+    logger.info("=" * 60)
+
+
+def main(offline: bool = False):
+    """
+    Main entry point for the AI avatar discussion stream.
+
+    Orchestrates the entire conversation flow, including:
+    - Setting up directories and connections
+    - Generating responses from agents
+    - Converting text to speech
+    - Animating avatars
+    - Managing topic switches
+
+    With offline=True the discussion is pre-rendered instead of streamed
+    (see render_offline).
+    """
+    try:
+        asyncio.run(render_offline() if offline else run_discussion())
     except KeyboardInterrupt:
         logger.info("Stream stopped by user")
     except Exception as e:
-        logger.critical(f"Fatal error in main loop: {e}", exc_info=True)
+        logger.critical("Fatal error in main loop: %s", e, exc_info=True)
         raise
+    finally:
+        # Flush buffered transcript lines to disk
+        close_transcript()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="AI avatar discussion stream")
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="pre-render audio and transcript via the Groq Batch API, no OBS",
+    )
+    main(offline=parser.parse_args().offline)
@@ -0,0 +1,111 @@
+"""Tests for utils.retry. Run from the repository root: python -m pytest"""
+
+import asyncio
+import inspect
+import time
+
+import pytest
+
+from utils.retry import retry_with_backoff
+
+
+def test_total_deadline_bounds_elapsed_time_with_slow_failing_function():
+    """A slow failing call gives up before another attempt would overrun."""
+    attempt_time = 0.2
+    deadline = 1.1
+    calls = 0
+
+    @retry_with_backoff(
+        max_retries=10, base_delay=0.3, jitter="none", total_deadline=deadline
+    )
+    def slow_failure():
+        nonlocal calls
+        calls += 1
+        time.sleep(attempt_time)
+        raise TimeoutError("upstream timed out")
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        slow_failure()
+    elapsed = time.monotonic() - started
+
+    assert calls > 1  # It did retry while there was room
+    assert elapsed <= deadline + 0.05
+
+
+def test_decorated_coroutine_function_is_still_detected_as_one():
+    @retry_with_backoff(max_retries=1)
+    async def fetch(x):
+        """Fetch x."""
+        return x
+
+    assert inspect.iscoroutinefunction(fetch)
+    assert asyncio.iscoroutinefunction(fetch)
+    assert fetch.__name__ == "fetch" and fetch.__doc__ == "Fetch x."
+    assert asyncio.run(fetch(3)) == 3
+
+
+def test_concurrent_async_callers_with_same_key_share_one_invocation():
+    calls = 0
+
+    @retry_with_backoff(max_retries=1, coalesce_key=lambda x: x)
+    async def fetch(x):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return x * 2
+
+    async def main():
+        return await asyncio.gather(*(fetch(1) for _ in range(5)), fetch(2))
+
+    assert asyncio.run(main()) == [2, 2, 2, 2, 2, 4]
+    assert calls == 2
+
+
+def test_cancelling_the_first_async_caller_does_not_cancel_the_others():
+    calls = 0
+
+    @retry_with_backoff(max_retries=1, coalesce_key=lambda x: x)
+    async def fetch(x):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return x
+
+    async def main():
+        leader = asyncio.create_task(fetch(7))
+        await asyncio.sleep(0)  # Let the leader start the shared call
+        followers = [asyncio.create_task(fetch(7)) for _ in range(2)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        return leader.cancelled(), results
+
+    assert asyncio.run(main()) == (True, [7, 7])
+    assert calls == 1
+
+
+def test_async_call_is_cancelled_once_every_caller_gave_up():
+    cancelled = False
+
+    @retry_with_backoff(max_retries=1, coalesce_key=lambda x: x)
+    async def fetch(x):
+        nonlocal cancelled
+        try:
+            await asyncio.sleep(0 if cancelled else 1)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        return x
+
+    async def main():
+        callers = [asyncio.create_task(fetch(1)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        return await asyncio.wait_for(fetch(1), 2)  # Starts afresh
+
+    asyncio.run(main())
+    assert cancelled
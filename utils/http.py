@@ -0,0 +1,43 @@
+"""
+Shared HTTP client setup for the Groq and ElevenLabs SDKs.
+
+Both SDKs talk to their APIs over httpx. The default pools drop idle
+connections after a few seconds, and a turn (generation + playback + pause)
+usually takes longer than that, so every call paid a fresh TCP + TLS
+handshake. These clients keep connections alive across turns, and speak
+HTTP/2 when the h2 package is installed so concurrent calls to the same
+host share one connection.
+"""
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (httpx only needs it importable)
+
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+# Idle connections kept open per client
+MAX_KEEPALIVE_CONNECTIONS = 4
+
+# Seconds an idle connection stays in the pool (outlasts a full turn)
+KEEPALIVE_EXPIRY = 300.0
+
+# Request timeout in seconds (TTS for a long reply can take a while)
+REQUEST_TIMEOUT = 60.0
+
+_LIMITS = httpx.Limits(
+    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=KEEPALIVE_EXPIRY,
+)
+
+
+def pooled_client() -> httpx.Client:
+    """Create an httpx client whose connections are reused across turns."""
+    return httpx.Client(http2=HAS_HTTP2, timeout=REQUEST_TIMEOUT, limits=_LIMITS)
+
+
+def pooled_async_client() -> httpx.AsyncClient:
+    """Async counterpart of pooled_client, for the SDKs' async clients."""
+    return httpx.AsyncClient(http2=HAS_HTTP2, timeout=REQUEST_TIMEOUT, limits=_LIMITS)
@@ -6,34 +6,785 @@ Usage:
     def my_api_call():
         # API call that might fail
         pass
+
+    @retry_with_backoff(max_retries=3, base_delay=1)
+    async def my_async_api_call():
+        # Backs off with asyncio.sleep, so the event loop isn't blocked
+        pass
 """
 
+import asyncio
+import concurrent.futures
+import email.utils
 import functools
+import inspect
+import random
+import socket
+import threading
 import time
-from typing import Any, Callable, TypeVar
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Literal, TypeVar
 
 from logger import get_logger
 
+try:
+    import httpx
+
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
 logger = get_logger(__name__)
 
+# Failures that happen before a request reaches the server (refused
+# connection, DNS lookup), so retrying can't repeat a side effect
+_NOT_SENT_ERRORS: tuple = (ConnectionRefusedError, socket.gaierror)
+if HAS_HTTPX:
+    _NOT_SENT_ERRORS += (httpx.ConnectError,)
+
+# Failures worth retrying whatever the status code (socket.timeout is an
+# alias of TimeoutError)
+_TRANSIENT_ERRORS: tuple = (ConnectionError, TimeoutError)
+if HAS_HTTPX:
+    _TRANSIENT_ERRORS += (httpx.TransportError,)
+
+# Non-5xx HTTP statuses worth retrying: request timeout and rate limited
+# (classify_transient retries every 5xx separately)
+_TRANSIENT_STATUSES = frozenset({408, 429})
+
+# Accepted values of retry_with_backoff's jitter argument
+_JITTER_MODES = frozenset({"full", "equal", "decorrelated", "none"})
+
 # Type variable for generic function signature
 F = TypeVar("F", bound=Callable[..., Any])
 
 
+class CircuitOpenError(Exception):
+    """Raised instead of calling a function whose circuit breaker is open."""
+
+
+@dataclass(slots=True)
+class RetryStats:
+    """
+    Running counters for one retried function (see get_stats). Updated
+    without a lock, so concurrent threads may occasionally lose a count.
+    """
+
+    attempts: int = 0  # Calls made to the function, first tries included
+    successes: int = 0  # Calls that returned, on any attempt
+    failures: int = 0  # Calls given up on (out of retries, circuit open, ...)
+    retries: int = 0  # Backoffs taken
+    total_sleep_ns: int = 0  # Time spent backing off
+
+
+@dataclass(frozen=True, slots=True)
+class RetryEvent:
+    """Passed to the on_retry callback before each backoff."""
+
+    func_name: str
+    attempt: int  # Attempt that failed, 1-based
+    error: BaseException
+    delay: float  # Seconds until the next attempt
+
+
+class _CircuitState:
+    """
+    Consecutive-failure circuit breaker shared by all calls to one function.
+
+    closed:    calls go through; trip_threshold failures in a row open it
+    open:      calls fail fast with CircuitOpenError until cooldown passes
+    half_open: one probe call goes through; success closes the circuit,
+               failure opens it again
+    """
+
+    def __init__(self, trip_threshold: int, cooldown: float):
+        self.trip_threshold = trip_threshold
+        self.cooldown = cooldown
+        self.cooldown_ns = int(cooldown * 1e9)
+        self.failures = 0
+        self.opened_at = 0  # time.monotonic_ns()
+        self.state = "closed"
+        self._lock = threading.Lock()
+
+    def before_call(self, name: str):
+        """Raise CircuitOpenError unless a call may go through now."""
+        with self._lock:
+            if self.state == "closed":
+                return
+            now = time.monotonic_ns()
+            if now - self.opened_at >= self.cooldown_ns:
+                # This caller is the probe. Restarting the clock means a probe
+                # that never reports back is replaced after another cooldown.
+                self.state = "half_open"
+                self.opened_at = now
+                return
+        raise CircuitOpenError(f"{name}: circuit open, not calling")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = "closed"
+
+    def record_failure(self) -> bool:
+        """Count a failed call; returns True if the circuit is now open."""
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.trip_threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic_ns()
+            return self.state == "open"
+
+
+def _causes(e: BaseException | None):
+    """Yield e and the exceptions it was raised from, innermost last."""
+    seen = set()
+    while e is not None and id(e) not in seen:
+        yield e
+        seen.add(id(e))
+        e = e.__cause__ or e.__context__
+
+
+def _never_sent(e: BaseException) -> bool:
+    """
+    Whether e (or an exception it was raised from, as SDK errors wrap
+    transport errors) shows the request never reached the server.
+    """
+    return any(isinstance(c, _NOT_SENT_ERRORS) for c in _causes(e))
+
+
+def _status_code(e: BaseException) -> int | None:
+    """HTTP status carried by e (SDK errors) or its .response (httpx)."""
+    status = getattr(e, "status_code", None)
+    if status is None:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def classify_transient(
+    e: BaseException,
+) -> Literal["retry", "fail", "retry_after"]:
+    """
+    Default retry classification: retry connection and timeout errors
+    (including ones an SDK error was raised from) and HTTP 408/429/5xx
+    responses, "retry_after" if such a response says when; anything else,
+    such as a bad request, an auth error or a bug, fails straight away.
+    """
+    status = _status_code(e)
+    if status is not None:
+        if status not in _TRANSIENT_STATUSES and not 500 <= status <= 599:
+            return "fail"
+        return "retry_after" if retry_after_from_response(e) is not None else "retry"
+    if any(isinstance(c, _TRANSIENT_ERRORS) for c in _causes(e)):
+        return "retry"
+    return "fail"
+
+
+class _TokenBucket:
+    """
+    Lazily refilled token bucket, shared by all calls to one function, that
+    caps how often they may retry in aggregate.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic_ns()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, n: float = 1.0) -> bool:
+        """Take n tokens if available; returns False (taking none) otherwise."""
+        with self._lock:
+            now = time.monotonic_ns()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.last) * self.rate / 1e9
+            )
+            self.last = now
+            if self.tokens < n:
+                return False
+            self.tokens -= n
+            return True
+
+
+def retry_after_from_response(e: BaseException) -> float | None:
+    """
+    Seconds the server asked us to wait, from the Retry-After header of the
+    response attached to e (httpx.HTTPStatusError and the Groq SDK's status
+    errors carry .response; ElevenLabs' ApiError carries .headers).
+    Accepts both delay-seconds and HTTP-date values. None if there is none.
+    """
+    response = getattr(e, "response", None)
+    headers = getattr(response, "headers", None) or getattr(e, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _sleep(delay: float) -> int:
+    """
+    Sleep until delay seconds have passed by the monotonic clock, going back
+    to sleep if woken early; returns the nanoseconds actually slept.
+    """
+    start = time.monotonic_ns()
+    deadline = start + int(delay * 1e9)
+    while (remaining := deadline - time.monotonic_ns()) > 0:
+        time.sleep(remaining / 1e9)
+    return time.monotonic_ns() - start
+
+
+def _jitter_range(jitter: str, capped: float) -> tuple[float, float]:
+    """
+    (floor, spread) such that the named jitter strategy draws a delay
+    uniformly from floor to floor + spread for a capped backoff delay.
+    """
+    if jitter == "full":
+        return 0.0, capped
+    if jitter == "equal":
+        return capped / 2, capped / 2
+    # "none"; "decorrelated" draws its delays in retry_delay instead
+    return capped, 0.0
+
+
+class Retrier:
+    """
+    Calls func, retrying failed attempts with backoff. Built once per
+    decorated function by retry_with_backoff (see there for the options),
+    which keeps the settings in slots rather than closure cells and returns
+    a plain function delegating to it, so the decorated function still
+    looks like one to inspect, method binding and frameworks.
+    """
+
+    __slots__ = (
+        "func",
+        "func_name",
+        "max_retries",
+        "base_delay",
+        "delays",
+        "exceptions",
+        "jitter",
+        "max_delay",
+        "circuit",
+        "idempotent",
+        "idempotency_key",
+        "retry_after_extractor",
+        "bucket",
+        "total_deadline",
+        "classify",
+        "non_retryable",
+        "on_retry",
+        "stats",
+    )
+
+    def __init__(
+        self,
+        func: Callable[..., Any],
+        max_retries: int,
+        base_delay: float,
+        exponential_base: float,
+        exceptions: tuple,
+        jitter: str,
+        max_delay: float,
+        trip_threshold: int | None,
+        cooldown: float,
+        idempotent: bool,
+        idempotency_key: Callable[..., str] | None,
+        retry_after_extractor: Callable[[BaseException], float | None] | None,
+        retry_rate_per_sec: float | None,
+        retry_burst: int,
+        total_deadline: float | None,
+        classify: Callable[[BaseException], str] | None,
+        non_retryable: tuple,
+        on_retry: Callable[[RetryEvent], None] | None,
+    ):
+        self.func = func
+        # Bound once for the log messages
+        self.func_name = getattr(func, "__qualname__", func.__name__)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        # Capped exponential delay before each retry, computed once per function
+        # and resolved into the jitter range it is drawn from, so a retry
+        # only does one multiply-add
+        self.delays = tuple(
+            (capped, *_jitter_range(jitter, capped))
+            for capped in (
+                min(max_delay, base_delay * exponential_base**i)
+                for i in range(max_retries)
+            )
+        )
+        self.exceptions = exceptions
+        self.jitter = jitter
+        self.max_delay = max_delay
+        self.circuit = (
+            _CircuitState(trip_threshold, cooldown) if trip_threshold else None
+        )
+        self.idempotent = idempotent
+        self.idempotency_key = idempotency_key
+        self.retry_after_extractor = retry_after_extractor
+        self.bucket = (
+            _TokenBucket(retry_rate_per_sec, retry_burst)
+            if retry_rate_per_sec
+            else None
+        )
+        self.total_deadline = total_deadline
+        self.classify = classify
+        self.non_retryable = non_retryable
+        self.on_retry = on_retry
+        self.stats = RetryStats()
+
+    def retry_delay(
+        self,
+        attempt: int,
+        e: Exception,
+        prev_delay: float,
+        started: int,
+        attempt_started: int,
+    ) -> float | None:
+        """
+        Log a failed attempt and return the delay before the next one,
+        or None if there are no retries left.
+
+        started and attempt_started are the monotonic_ns times the call and
+        the failed attempt began (only read when total_deadline is set).
+        """
+        name = self.func_name
+        max_retries = self.max_retries
+        max_delay = self.max_delay
+
+        # Deterministic failures (bad request, auth, bugs) fail fast and
+        # don't count against the circuit
+        if isinstance(e, self.non_retryable) or (
+            self.classify is not None and self.classify(e) == "fail"
+        ):
+            logger.error("%s failed: %s. Not a transient error, not retrying", name, e)
+            return None
+
+        circuit = self.circuit
+        if circuit is not None and circuit.record_failure():
+            logger.error(
+                "%s failed: %s. Circuit open for %.0fs, not retrying",
+                name,
+                e,
+                circuit.cooldown,
+            )
+            return None
+
+        if not self.idempotent and not _never_sent(e):
+            logger.error(
+                "%s failed: %s. Not retrying a non-idempotent call that may have "
+                "reached the server",
+                name,
+                e,
+            )
+            return None
+
+        if attempt == max_retries:
+            logger.error("%s failed after %d attempts: %s", name, max_retries + 1, e)
+            return None
+
+        if self.bucket is not None and not self.bucket.try_acquire():
+            logger.error("%s failed: %s. Retry budget exhausted, not retrying", name, e)
+            return None
+
+        if self.jitter == "decorrelated":
+            # Each delay is drawn relative to the previous one
+            capped = min(max_delay, prev_delay * 3.0)
+            delay = min(max_delay, random.uniform(self.base_delay, prev_delay * 3.0))
+        else:
+            # Exponential backoff, capped, then jittered
+            capped, floor, spread = self.delays[attempt]
+            delay = floor + spread * random.random() if spread else floor
+
+        # Wait at least as long as the server asked (e.g. on a 429)
+        if self.retry_after_extractor is not None:
+            retry_after = self.retry_after_extractor(e)
+            if retry_after is not None and retry_after > delay:
+                delay = min(max_delay, retry_after)
+                logger.debug("%s: server asked to retry after %.1fs", name, retry_after)
+
+        total_deadline = self.total_deadline
+        if total_deadline is not None:
+            now = time.monotonic_ns()
+            remaining = total_deadline - (now - started) / 1e9
+            # The backoff plus another attempt, assumed to take as long as
+            # the one that just failed, must fit in what's left
+            needed = delay + (now - attempt_started) / 1e9
+            if remaining < needed:
+                logger.error(
+                    "%s failed: %s. Deadline of %.1fs leaves %.1fs, "
+                    "%.1fs needed to retry; not retrying",
+                    name,
+                    e,
+                    total_deadline,
+                    max(remaining, 0.0),
+                    needed,
+                )
+                return None
+        logger.warning(
+            "%s failed (attempt %d/%d): %s. Retrying in %.1fs (backoff cap %.1fs)...",
+            name,
+            attempt + 1,
+            max_retries + 1,
+            e,
+            delay,
+            capped,
+        )
+        return delay
+
+    def _report_retry(self, attempt: int, error: Exception, delay: float):
+        """Pass a retry to on_retry; a failing callback mustn't stop the retry."""
+        try:
+            self.on_retry(RetryEvent(self.func_name, attempt + 1, error, delay))
+        except Exception:
+            logger.exception("%s: on_retry callback failed", self.func_name)
+
+    def _admit(self, circuit: _CircuitState):
+        """circuit.before_call, counting a call it rejects as failed."""
+        try:
+            circuit.before_call(self.func_name)
+        except CircuitOpenError:
+            self.stats.failures += 1
+            raise
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        # The clock is only needed to enforce total_deadline
+        started = time.monotonic_ns() if self.total_deadline is not None else 0
+        if self.idempotency_key is not None:
+            kwargs["_idempotency_key"] = self.idempotency_key(*args, **kwargs)
+
+        # Fast path: most calls succeed first time, so the first attempt
+        # runs without the retry loop's bookkeeping
+        circuit = self.circuit
+        if circuit is not None:
+            self._admit(circuit)
+        stats = self.stats
+        stats.attempts += 1
+        try:
+            result = self.func(*args, **kwargs)
+        except self.exceptions as e:
+            error = e
+        else:
+            if circuit is not None:
+                circuit.record_success()
+            stats.successes += 1
+            return result
+        # Outside the except block, so later failures aren't chained to it
+        return self._retry(args, kwargs, error, started)
+
+    def _retry(self, args: tuple, kwargs: dict, error: Exception, started: int) -> Any:
+        """Back off and retry after the first attempt failed with error."""
+        func = self.func
+        name = self.func_name
+        circuit = self.circuit
+        stats = self.stats
+        prev_delay = self.base_delay  # Only used by decorrelated jitter
+        timed = self.total_deadline is not None
+        attempt_started = started
+        attempt = 0
+        while True:
+            delay = self.retry_delay(
+                attempt, error, prev_delay, started, attempt_started
+            )
+            if delay is None:
+                stats.failures += 1
+                raise error
+            if self.on_retry is not None:
+                self._report_retry(attempt, error, delay)
+            prev_delay = delay
+            slept = _sleep(delay)
+            stats.retries += 1
+            stats.total_sleep_ns += slept
+            logger.debug(
+                "%s: backed off %.2fs (planned %.2fs)", name, slept / 1e9, delay
+            )
+
+            attempt += 1
+            if circuit is not None:
+                self._admit(circuit)
+            stats.attempts += 1
+            if timed:
+                attempt_started = time.monotonic_ns()
+            try:
+                result = func(*args, **kwargs)
+            except self.exceptions as e:
+                error = e
+            else:
+                if circuit is not None:
+                    circuit.record_success()
+                stats.successes += 1
+                return result
+
+
+class AsyncRetrier(Retrier):
+    """
+    Retrier for coroutine functions: backs off with asyncio.sleep so the
+    event loop keeps running other tasks in the meantime.
+    """
+
+    __slots__ = ()
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        # The clock is only needed to enforce total_deadline
+        started = time.monotonic_ns() if self.total_deadline is not None else 0
+        if self.idempotency_key is not None:
+            kwargs["_idempotency_key"] = self.idempotency_key(*args, **kwargs)
+
+        # Fast path, as in Retrier.__call__
+        circuit = self.circuit
+        if circuit is not None:
+            self._admit(circuit)
+        stats = self.stats
+        stats.attempts += 1
+        try:
+            result = await self.func(*args, **kwargs)
+        except self.exceptions as e:
+            error = e
+        else:
+            if circuit is not None:
+                circuit.record_success()
+            stats.successes += 1
+            return result
+        return await self._retry(args, kwargs, error, started)
+
+    async def _retry(
+        self, args: tuple, kwargs: dict, error: Exception, started: int
+    ) -> Any:
+        """Back off and retry after the first attempt failed with error."""
+        func = self.func
+        name = self.func_name
+        circuit = self.circuit
+        stats = self.stats
+        prev_delay = self.base_delay  # Only used by decorrelated jitter
+        timed = self.total_deadline is not None
+        attempt_started = started
+        attempt = 0
+        while True:
+            delay = self.retry_delay(
+                attempt, error, prev_delay, started, attempt_started
+            )
+            if delay is None:
+                stats.failures += 1
+                raise error
+            if self.on_retry is not None:
+                self._report_retry(attempt, error, delay)
+            prev_delay = delay
+            slept_from = time.monotonic_ns()
+            await asyncio.sleep(delay)
+            slept = time.monotonic_ns() - slept_from
+            stats.retries += 1
+            stats.total_sleep_ns += slept
+            logger.debug(
+                "%s: backed off %.2fs (planned %.2fs)", name, slept / 1e9, delay
+            )
+
+            attempt += 1
+            if circuit is not None:
+                self._admit(circuit)
+            stats.attempts += 1
+            if timed:
+                attempt_started = time.monotonic_ns()
+            try:
+                result = await func(*args, **kwargs)
+            except self.exceptions as e:
+                error = e
+            else:
+                if circuit is not None:
+                    circuit.record_success()
+                stats.successes += 1
+                return result
+
+
+class CoalescingRetrier(Retrier):
+    """
+    Retrier that runs concurrent calls with the same coalesce key once: the
+    first caller makes the call (retries included), the others wait for
+    and share its result or exception.
+    """
+
+    __slots__ = ("coalesce_key", "_inflight", "_inflight_lock")
+
+    def __init__(self, *args: Any, coalesce_key: Callable[..., Hashable]):
+        super().__init__(*args)
+        self.coalesce_key = coalesce_key
+        self._inflight: dict[Hashable, concurrent.futures.Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        key = self.coalesce_key(*args, **kwargs)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = concurrent.futures.Future()
+        if not leader:
+            return future.result(timeout=self.total_deadline)
+
+        try:
+            result = super().__call__(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+
+class AsyncCoalescingRetrier(AsyncRetrier):
+    """
+    CoalescingRetrier for coroutine functions, per event loop. The shared
+    call runs in its own task that every caller, the first included, awaits
+    through asyncio.shield, so a caller being cancelled only cancels its
+    own wait; the task is cancelled once no caller is waiting for it.
+    """
+
+    __slots__ = ("coalesce_key", "_inflight")
+
+    def __init__(self, *args: Any, coalesce_key: Callable[..., Hashable]):
+        super().__init__(*args)
+        self.coalesce_key = coalesce_key
+        # (loop, key) -> [task, number of callers waiting for it]
+        self._inflight: dict[tuple, list] = {}
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        key = (loop, self.coalesce_key(*args, **kwargs))
+        entry = self._inflight.get(key)
+        if entry is None:
+            task = loop.create_task(super().__call__(*args, **kwargs))
+            entry = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda _, entry=entry: self._forget(key, entry))
+        task = entry[0]
+
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if not entry[1] and not task.done():
+                # Every caller gave up waiting; later callers start afresh
+                self._forget(key, entry)
+                task.cancel()
+
+    def _forget(self, key: tuple, entry: list):
+        """Drop entry from the in-flight table unless it was already replaced."""
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+
+
+def get_stats(func: Callable[..., Any]) -> RetryStats:
+    """
+    Counters of a function decorated with retry_with_backoff, e.g. to
+    export as metrics. Raises TypeError for any other function.
+    """
+    func = getattr(func, "__func__", func)  # Unwrap bound methods
+    retrier = getattr(func, "retrier", None)
+    if not isinstance(retrier, Retrier):
+        raise TypeError(f"{func!r} is not decorated with retry_with_backoff")
+    return retrier.stats
+
+
 def retry_with_backoff(
     max_retries: int = 3,
     base_delay: float = 1.0,
     exponential_base: float = 2.0,
     exceptions: tuple = (Exception,),
+    jitter: str = "full",
+    max_delay: float = 60.0,
+    trip_threshold: int | None = None,
+    cooldown: float = 30.0,
+    idempotent: bool = True,
+    idempotency_key: Callable[..., str] | None = None,
+    retry_after_extractor: (
+        Callable[[BaseException], float | None] | None
+    ) = retry_after_from_response,
+    retry_rate_per_sec: float | None = None,
+    retry_burst: int = 10,
+    total_deadline: float | None = None,
+    classify: (
+        Callable[[BaseException], Literal["retry", "fail", "retry_after"]] | None
+    ) = classify_transient,
+    non_retryable: tuple = (),
+    coalesce_key: Callable[..., Hashable] | None = None,
+    on_retry: Callable[[RetryEvent], None] | None = None,
 ) -> Callable[[F], F]:
     """
     Decorator that retries a function with exponential backoff on failure.
 
+    Works on both plain functions and coroutine functions; the latter wait
+    out the backoff with asyncio.sleep instead of blocking the event loop.
+
     Args:
         max_retries: Maximum number of retry attempts (default: 3)
         base_delay: Initial delay in seconds between retries (default: 1.0)
         exponential_base: Base for exponential backoff calculation (default: 2.0)
         exceptions: Tuple of exception types to catch and retry (default: all exceptions)
+        jitter: How the backoff delay is randomized (default: "full"):
+            "full"  - uniform between 0 and the capped delay
+            "equal" - half the capped delay plus uniform up to the other half
+            "decorrelated" - uniform between base_delay and 3x the previous
+                      delay, capped at max_delay (ignores exponential_base)
+            "none"  - the capped delay itself
+            Randomizing keeps clients that failed together from retrying in
+            lockstep. Any other value raises ValueError.
+        max_delay: Upper bound on the backoff delay in seconds (default: 60.0)
+        trip_threshold: Consecutive failed attempts, across all calls, after
+            which the circuit opens and calls raise CircuitOpenError without
+            being attempted (default: None, no circuit breaker)
+        cooldown: Seconds the circuit stays open before one probe call is
+            let through (default: 30.0)
+        idempotent: Whether repeating the call is harmless (default: True).
+            If False, only failures where the request never reached the
+            server (refused connection, DNS error) are retried; a timeout
+            may mean the server already acted, so it is not.
+        idempotency_key: Optional function computing a key from the call's
+            arguments. It is computed once per call and passed to every
+            attempt as the _idempotency_key keyword argument, for the
+            function to send (e.g. as an Idempotency-Key header) so the
+            server can de-duplicate retries.
+        retry_after_extractor: Reads a server-requested delay from the
+            exception; the backoff delay is raised to at least that, still
+            capped at max_delay (default: retry_after_from_response, which
+            reads the Retry-After header). None ignores server hints.
+        retry_rate_per_sec: Sustained rate at which retries are allowed,
+            across all calls to the function; a failure arriving when the
+            budget is spent is raised instead of retried, so many concurrent
+            failing calls can't multiply load on a struggling upstream
+            (default: None, no limit). First attempts are never limited.
+        retry_burst: Retries allowed back to back before retry_rate_per_sec
+            applies (default: 10)
+        total_deadline: Seconds a call may take overall, attempts and
+            backoff included. A retry is given up, and the error raised at
+            once, unless its delay plus another attempt (assumed to take as
+            long as the one that failed) fits in the time left (default: None)
+        classify: Decides from a caught exception whether it is worth
+            retrying; "fail" raises it at once, without backoff (default:
+            classify_transient, which retries only connection/timeout
+            errors and HTTP 408/429/5xx). None retries everything caught.
+        non_retryable: Exception types raised at once even if they match
+            exceptions and classify (default: none)
+        coalesce_key: Optional function computing a key from the call's
+            arguments. While a call is in flight, calls with an equal key
+            wait for its result (or exception) instead of calling again,
+            so N identical failing calls retry once rather than N times
+            (default: None, no coalescing)
+        on_retry: Optional callback given a RetryEvent before each backoff,
+            e.g. to count retries in a metrics system. Exceptions it raises
+            are logged and ignored. Running totals are kept regardless; see
+            get_stats (default: None)
 
     Returns:
         Decorated function with retry logic
@@ -44,36 +795,59 @@ def retry_with_backoff(
             response = requests.get("https://api.example.com")
             return response.json()
     """
+    # Fail at decoration time: a typo must not silently turn off jitter
+    if jitter not in _JITTER_MODES:
+        raise ValueError(
+            f"jitter must be one of {sorted(_JITTER_MODES)}, got {jitter!r}"
+        )
 
     def decorator(func: F) -> F:
+        is_async = inspect.iscoroutinefunction(func)
+        settings = (
+            func,
+            max_retries,
+            base_delay,
+            exponential_base,
+            exceptions,
+            jitter,
+            max_delay,
+            trip_threshold,
+            cooldown,
+            idempotent,
+            idempotency_key,
+            retry_after_extractor,
+            retry_rate_per_sec,
+            retry_burst,
+            total_deadline,
+            classify,
+            non_retryable,
+            on_retry,
+        )
+        if coalesce_key is not None:
+            cls = AsyncCoalescingRetrier if is_async else CoalescingRetrier
+            retrier = cls(*settings, coalesce_key=coalesce_key)
+        else:
+            cls = AsyncRetrier if is_async else Retrier
+            retrier = cls(*settings)
+
+        # Real functions rather than the Retrier itself, so coroutine
+        # detection (inspect/asyncio.iscoroutinefunction), signatures and
+        # method binding behave as for the undecorated function
+        call = retrier.__call__  # Bound once; saves the lookup per call
+        if is_async:
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                return await call(*args, **kwargs)
+
+            async_wrapper.retrier = retrier  # type: ignore[attr-defined]
+            return async_wrapper  # type: ignore
+
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            last_exception = None
-
-            for attempt in range(max_retries + 1):
-                try:
-                    return func(*args, **kwargs)
-                except exceptions as e:
-                    last_exception = e
-
-                    if attempt == max_retries:
-                        logger.error(
-                            f"{func.__name__} failed after {max_retries + 1} attempts: {e}"
-                        )
-                        raise
-
-                    # Calculate delay with exponential backoff
-                    delay = base_delay * (exponential_base**attempt)
-                    logger.warning(
-                        f"{func.__name__} failed (attempt {attempt + 1}/{max_retries + 1}): {e}. "
-                        f"Retrying in {delay:.1f}s..."
-                    )
-                    time.sleep(delay)
-
-            # This should never be reached, but satisfies type checker
-            if last_exception:
-                raise last_exception
+            return call(*args, **kwargs)
 
+        wrapper.retrier = retrier  # type: ignore[attr-defined]
         return wrapper  # type: ignore
 
     return decorator